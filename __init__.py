@@ -84,7 +84,7 @@ else:
         ops_utils,
         ops_weighting,
     )
-    from .lib import on_load
+    from .lib import on_load, on_update
 
 
 classes = (
@@ -123,6 +123,7 @@ classes = (
     ui.VIEW3D_PT_jewelcraft_curve_editmesh,
     ui.VIEW3D_PT_jewelcraft_weighting,
     ui.VIEW3D_PT_jewelcraft_design_report,
+    ui.VIEW3D_PT_jewelcraft_design_report_totals,
     ui.VIEW3D_PT_jewelcraft_measurement,
     op_cutter.Dimensions,
     op_cutter.OBJECT_OT_cutter_add,
@@ -222,6 +223,8 @@ def register():
     # Versioning ---------------------------
 
     on_load.handler_add()
+    on_update.handler_add()
+    op_design_report.report_live.handler_add()
 
     # mod_update
     # ---------------------------
@@ -259,6 +262,8 @@ def unregister():
 
     spacing_overlay.handler_del()
     on_load.handler_del()
+    on_update.handler_del()
+    op_design_report.report_live.handler_del()
 
     # Translations
     # ---------------------------
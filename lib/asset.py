@@ -20,21 +20,25 @@
 
 
 import os
-from typing import Tuple, Set, Sequence, Union, Optional, List, Iterable
+from typing import Tuple, Set, Union, Optional, List, Iterable
 
 import bpy
 from bpy.types import Object, BlendData, ID, Space
 from bpy.app.translations import pgettext_iface as _
-from mathutils import Matrix, Vector, kdtree
+from mathutils import Matrix, Vector
+import numpy as np
 
-from . import mesh, unit, gemlib
+from . import mesh, unit, gemlib, overlap
 
 
-ObjectData = Tuple[Vector, float, Matrix]
+OverlapPair = Tuple[int, int, float]
 Color = Tuple[float, float, float, float]
 BoundBox = List[Vector]
 
 
+OVERLAP_PARALLEL_MIN = 50000
+
+
 # Gem
 # ------------------------------------
 
@@ -87,46 +91,43 @@ def calc_gap(co1: Vector, co2: Vector, loc1: Vector, dist_locs: float, rad1: flo
     return (co1 - co2).length
 
 
-def gem_overlap(context, data: Sequence[ObjectData], threshold: float, first_match=False) -> Union[Set[int], bool]:
-    kd = kdtree.KDTree(len(data))
-
-    for i, (loc, _, _) in enumerate(data):
-        kd.insert(loc, i)
-
-    kd.balance()
-
-    UnitScale = unit.Scale(context)
-    from_scene_scale = UnitScale.from_scene
-
-    overlap_indices = set()
-    seek_range = UnitScale.to_scene(4.0)
-
-    for i1, (loc1, rad1, mat1) in enumerate(data):
-
-        if i1 in overlap_indices:
-            continue
-
-        for loc2, i2, dis_obs in kd.find_range(loc1, seek_range):
-
-            _, rad2, mat2 = data[i2]
-            dis_gap = dis_obs - (rad1 + rad2)
-
-            if dis_gap > threshold or i1 == i2:
-                continue
-
-            co1, co2 = nearest_coords(rad1, rad2, mat1, mat2)
-            dis_gap = from_scene_scale(calc_gap(co1, co2, loc1, dis_obs, rad1))
+def gem_overlap(
+    context,
+    locs: np.ndarray,
+    rads: np.ndarray,
+    mats: np.ndarray,
+    threshold: float,
+    first_match=False,
+    pairs=False,
+    workers=1,
+) -> Union[Set[int], bool, List[OverlapPair]]:
+    if not len(locs):
+        if first_match:
+            return False
+        if pairs:
+            return []
+        return set()
+
+    scale = unit.Scale(context).from_scene(1.0)
+
+    if workers > 1 and len(locs) >= OVERLAP_PARALLEL_MIN:
+        if bpy.app.version < (2, 91, 0):
+            executable = bpy.app.binary_path_python
+        else:
+            executable = None
 
-            if dis_gap < threshold:
-                if first_match:
-                    return True
-                overlap_indices.add(i1)
-                break
+        i1, i2, gaps = overlap.find_overlaps_parallel(locs, rads, mats, threshold, scale, workers, executable)
+    else:
+        i1, i2, gaps = overlap.find_overlaps(locs, rads, mats, threshold, scale)
 
     if first_match:
-        return False
+        return bool(len(i1))
+
+    if pairs:
+        i1, i2, gaps = overlap.unique_pairs(i1, i2, gaps)
+        return list(zip(i1.tolist(), i2.tolist(), gaps.tolist()))
 
-    return overlap_indices
+    return set(np.unique(i1).tolist())
 
 
 # Material
@@ -19,9 +19,11 @@
 # ##### END GPL LICENSE BLOCK #####
 
 
-from typing import NamedTuple, Tuple, Optional
+from typing import NamedTuple, Tuple, Optional, Sequence
 from math import pi
 
+import numpy as np
+
 from . import unit
 
 
@@ -124,3 +126,59 @@ def ct_calc(stone: str, cut: str, size: Tuple[float, float, float]) -> float:
     ct = unit.convert_g_ct(g)
 
     return round(ct, 3)
+
+
+def ct_calc_batch(
+    stone_ids: Sequence[str],
+    cut_ids: Sequence[str],
+    stones: np.ndarray,
+    cuts: np.ndarray,
+    sizes: np.ndarray,
+) -> np.ndarray:
+    """Same as ct_calc for arrays of stone and cut codes indexing into stone_ids and cut_ids"""
+    stone_dens = np.zeros(len(stone_ids))
+    cut_corr = np.zeros(len(cut_ids))
+    cut_shape = np.full(len(cut_ids), -1)
+
+    for i, stone in enumerate(stone_ids):
+        if stone in STONES:
+            stone_dens[i] = unit.convert_cm3_mm3(STONES[stone].density)
+
+    for i, cut in enumerate(cut_ids):
+        if cut in CUTS:
+            cut_corr[i] = CUTS[cut].vol_correction
+            cut_shape[i] = CUTS[cut].vol_shape
+
+    # Keep operation order of ct_calc to get identical results
+    w, l, h = np.asarray(sizes, dtype=np.float64).T
+    shape = cut_shape[cuts]
+    vol = np.zeros(len(shape))
+
+    m = shape == VOL_CONE
+    vol[m] = pi * (l[m] / 2) * (w[m] / 2) * (h[m] / 3)
+    m = shape == VOL_PYRAMID
+    vol[m] = (l[m] * w[m] * h[m]) / 3
+    m = shape == VOL_PRISM
+    vol[m] = l[m] * w[m] * (h[m] / 2)
+    m = shape == VOL_TETRAHEDRON
+    vol[m] = (l[m] * w[m] * h[m]) / 6
+
+    g = vol * cut_corr[cuts] * stone_dens[stones]
+    ct = unit.convert_g_ct(g)
+
+    # Python round, applied to unique values only
+    values, inverse = np.unique(ct, return_inverse=True)
+    values = np.array([round(x, 3) for x in values.tolist()])
+
+    return values[inverse]
+
+
+def ct_calc_items(items: Sequence[Tuple[str, str, Tuple[float, float, float]]]) -> np.ndarray:
+    if not items:
+        return np.empty(0)
+
+    stone_ids, stones = np.unique([x[0] for x in items], return_inverse=True)
+    cut_ids, cuts = np.unique([x[1] for x in items], return_inverse=True)
+    sizes = np.array([x[2] for x in items], dtype=np.float64)
+
+    return ct_calc_batch(stone_ids.tolist(), cut_ids.tolist(), stones, cuts, sizes)
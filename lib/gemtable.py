@@ -0,0 +1,278 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  JewelCraft jewelry design toolkit for Blender.
+#  Copyright (C) 2015-2021  Mikhail Rachinskiy
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+
+from typing import Tuple, List, Dict, Set, Optional, Any, Iterator
+
+import bpy
+from bpy.types import Object
+from mathutils import Matrix, Vector
+import numpy as np
+
+from . import unit
+
+
+Size = Tuple[float, float, float]
+
+
+class GemTable:
+    """Gem instances of the evaluated scene, one row per instance"""
+
+    __slots__ = (
+        "is_valid",
+        "key",
+        "version",
+        "version_build",
+        "obs",
+        "owners",
+        "overrides",
+        "is_instance",
+        "is_source",
+        "stones",
+        "cuts",
+        "sizes",
+        "locs",
+        "rads",
+        "mats",
+        "mats_world",
+        "stone_ids",
+        "cut_ids",
+        "collections",
+        "row_versions",
+        "_rows",
+        "_instanced",
+        "_Scale",
+    )
+
+    def __init__(self) -> None:
+        self.version = 0
+        self.version_build = 0
+        self.clear()
+
+    def clear(self) -> None:
+        self.is_valid = False
+        self.key = None
+        self.obs: List[Object] = []
+        self.owners: List[Optional[Object]] = []
+        self.overrides: List[Optional[Dict[str, Any]]] = []
+        self.is_instance = np.empty(0, dtype=bool)
+        self.is_source = np.empty(0, dtype=bool)
+        self.stones = np.empty(0, dtype=np.int32)
+        self.cuts = np.empty(0, dtype=np.int32)
+        self.sizes = np.empty((0, 3))
+        self.locs = np.empty((0, 3))
+        self.rads = np.empty(0)
+        self.mats = np.empty((0, 4, 4))
+        self.mats_world = np.empty((0, 4, 4))
+        self.stone_ids: List[str] = []
+        self.cut_ids: List[str] = []
+        self.collections: Set[str] = set()
+        self.row_versions = np.empty(0, dtype=np.int64)
+        self._rows: Dict[str, int] = {}
+        self._instanced = set()
+        self._Scale = None
+
+    def __len__(self) -> int:
+        return len(self.obs)
+
+    @property
+    def max_rad(self) -> float:
+        return float(self.rads.max(initial=0.0))
+
+    def find_range(self, loc: Vector, radius: float) -> List[int]:
+        """Indices of gems within radius from location, in table order"""
+        diff = self.locs - np.array(loc, dtype=np.float64)
+        dist_sq = np.einsum("ij,ij->i", diff, diff)
+        return np.flatnonzero(dist_sq <= radius * radius).tolist()
+
+    def rows_changed(self, version_build: Optional[int], version: Optional[int]) -> Optional[np.ndarray]:
+        """Rows updated after given table version, None if table was rebuilt since"""
+        if version_build != self.version_build or version is None:
+            return None
+        return np.flatnonzero(self.row_versions > version)
+
+    def stone_cut_size(self, i: int) -> Tuple[str, str, Size]:
+        return self.stone_ids[self.stones[i]], self.cut_ids[self.cuts[i]], tuple(self.sizes[i].tolist())
+
+    def unique_obs(self, mask: Optional[np.ndarray] = None) -> Iterator[Object]:
+        if mask is None:
+            indices = range(len(self.obs))
+        else:
+            indices = np.flatnonzero(mask).tolist()
+
+        seen = set()
+
+        for i in indices:
+            ob = self.obs[i]
+            if ob.name not in seen:
+                seen.add(ob.name)
+                yield ob
+
+    @staticmethod
+    def get_key(depsgraph) -> Tuple[str, str]:
+        return depsgraph.scene.name, depsgraph.view_layer.name
+
+    # Build
+    # ---------------------------
+
+    def build(self, context, depsgraph) -> None:
+        self.clear()
+        self._Scale = unit.Scale(context)
+
+        is_instance = []
+        ob_data = []
+        mats = []
+        mats_world = []
+
+        for dup in depsgraph.object_instances:
+
+            if dup.is_instance:
+                ob = dup.instance_object.original
+            else:
+                ob = dup.object.original
+
+            if "gem" not in ob:
+                continue
+
+            if dup.is_instance:
+                self._instanced.add(ob.name)
+                owner = ob.parent if ob.parent and ob.parent.is_instancer else None
+            else:
+                self._rows[ob.name] = len(self.obs)
+                owner = ob
+
+            self.obs.append(ob)
+            self.owners.append(owner)
+            self.overrides.append(self._get_overrides(ob))
+            is_instance.append(dup.is_instance)
+            ob_data.append(self._get_ob_data(ob))
+            mats.append(self._get_mat(dup.matrix_world, dup.is_instance))
+            mats_world.append(dup.matrix_world.copy())
+
+        if self.obs:
+            self.is_instance = np.array(is_instance, dtype=bool)
+            self.is_source = ~self.is_instance & np.array([ob.name in self._instanced for ob in self.obs], dtype=bool)
+            self.stones = np.array([x[0] for x in ob_data], dtype=np.int32)
+            self.cuts = np.array([x[1] for x in ob_data], dtype=np.int32)
+            self.sizes = np.array([x[2] for x in ob_data], dtype=np.float64)
+            self.rads = np.array([x[3] for x in ob_data], dtype=np.float64)
+            self.mats = np.array(mats, dtype=np.float64)
+            self.mats_world = np.array(mats_world, dtype=np.float64)
+            self.locs = self.mats_world[:, :3, 3].copy()
+
+            for ob in self.unique_obs():
+                self.collections.update(coll.name for coll in ob.users_collection)
+
+        self.key = self.get_key(depsgraph)
+        self.is_valid = True
+        self.version += 1
+        self.version_build = self.version
+        self.row_versions = np.full(len(self.obs), self.version, dtype=np.int64)
+
+    def update(self, depsgraph) -> None:
+        if self.key != self.get_key(depsgraph):
+            self.is_valid = False
+            return
+
+        for upd in depsgraph.updates:
+
+            if isinstance(upd.id, (bpy.types.Scene, bpy.types.Collection)):
+                self.is_valid = False
+                return
+
+            if not isinstance(upd.id, bpy.types.Object):
+                continue
+
+            ob = upd.id.original
+
+            if ob.is_instancer or ob.name in self._instanced:
+                self.is_valid = False
+                return
+
+            if "gem" not in ob:
+                if ob.name in self._rows:
+                    self.is_valid = False
+                    return
+                continue
+
+            i = self._rows.get(ob.name)
+
+            if i is None:
+                self.is_valid = False
+                return
+
+            mat_world = upd.id.matrix_world
+            self.stones[i], self.cuts[i], self.sizes[i], self.rads[i] = self._get_ob_data(ob)
+            self.overrides[i] = self._get_overrides(ob)
+            self.mats[i] = self._get_mat(mat_world, False)
+            self.mats_world[i] = mat_world
+            self.locs[i] = mat_world.translation
+            self.version += 1
+            self.row_versions[i] = self.version
+
+    def _get_ob_data(self, ob: Object) -> Tuple[int, int, Size, float]:
+        stone = self._get_code(self.stone_ids, ob["gem"]["stone"])
+        cut = self._get_code(self.cut_ids, ob["gem"]["cut"])
+        size = tuple(round(x, 2) for x in self._Scale.from_scene_batch(ob.dimensions))
+        rad = max(ob.dimensions.xy) / 2
+        return stone, cut, size, rad
+
+    @staticmethod
+    def _get_code(ids: List[str], id_: str) -> int:
+        try:
+            return ids.index(id_)
+        except ValueError:
+            ids.append(id_)
+            return len(ids) - 1
+
+    @staticmethod
+    def _get_mat(mat_world: Matrix, is_instance: bool) -> Matrix:
+        if is_instance:
+            return mat_world
+
+        mat_loc = Matrix.Translation(mat_world.translation)
+        mat_rot = mat_world.to_quaternion().to_matrix().to_4x4()
+        return mat_loc @ mat_rot
+
+    @staticmethod
+    def _get_overrides(ob: Object) -> Optional[Dict[str, Any]]:
+        if "gem_overlay" in ob:
+            return ob["gem_overlay"].to_dict()
+
+
+_table = GemTable()
+
+
+def get(context) -> GemTable:
+    depsgraph = context.evaluated_depsgraph_get()
+
+    if not _table.is_valid or _table.key != _table.get_key(depsgraph):
+        _table.build(context, depsgraph)
+
+    return _table
+
+
+def tag_update(depsgraph) -> None:
+    if _table.is_valid:
+        _table.update(depsgraph)
+
+
+def clear() -> None:
+    _table.clear()
@@ -17,38 +17,116 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
 # ##### END GPL LICENSE BLOCK #####
+from typing import List, Iterable, Tuple, Dict, Sequence, Optional
 
-
-from typing import List, Iterable, Tuple
+from typing import List, Iterable, Tuple, Dict, Sequence
 
 import bpy
 from bpy.types import Object
 import bmesh
 from bmesh.types import BMesh, BMVert, BMEdge, BMFace
 from mathutils import Matrix
+import numpy as np
 
 from .iterutils import pairwise_cyclic, quadwise_cyclic
 
 
-def est_volume(obs: Iterable[Object]) -> float:
+_volume_cache: Dict[str, Tuple[Optional[Tuple[str, int, int]], float]] = {}
+
+
+def _mesh_arrays(me) -> Tuple[np.ndarray, np.ndarray]:
+    me.calc_loop_triangles()
+
+    vert_count = len(me.vertices)
+    tri_count = len(me.loop_triangles)
+
+    # Read in native float32 to hit the buffer fast path, widen afterwards
+    cos = np.empty(vert_count * 3, dtype=np.float32)
+    me.vertices.foreach_get("co", cos)
+    cos = cos.reshape(vert_count, 3).astype(np.float64)
+
+    tris = np.empty(tri_count * 3, dtype=np.int32)
+    me.loop_triangles.foreach_get("vertices", tris)
+    tris.shape = (tri_count, 3)
+
+    return cos, tris
+
+
+def _signed_volume(cos: np.ndarray, tris: np.ndarray) -> float:
+    if not len(tris):
+        return 0.0
+
+    v1 = cos[tris[:, 0]]
+    v2 = cos[tris[:, 1]]
+    v3 = cos[tris[:, 2]]
+
+    return float(np.einsum("ij,ij->", v1, np.cross(v2, v3))) / 6.0
+
+
+def _volume_key(ob_eval: Object) -> Optional[Tuple[str, int, int]]:
+    me = ob_eval.data
+
+    if not isinstance(me, bpy.types.Mesh):
+        return None
+
+    # Triangle count of n-gons is loops - 2 * polygons
+    return me.name, len(me.vertices), len(me.loops) - 2 * len(me.polygons)
+
+
+def est_volume_batch(obs: Sequence[Object], workers: int = 1) -> List[float]:
+    """Signed world space volume of each object"""
+    # Evaluate pending updates first, so the depsgraph handler
+    # invalidates stale cache entries before they are looked up
     depsgraph = bpy.context.evaluated_depsgraph_get()
-    bm = bmesh.new()
+    vols_local = [0.0] * len(obs)
+    queue = []
 
-    for ob in obs:
+    for i, ob in enumerate(obs):
         ob_eval = ob.evaluated_get(depsgraph)
-        me = ob_eval.to_mesh()
-        me.transform(ob.matrix_world)
+        key = _volume_key(ob_eval)
+        cached = _volume_cache.get(ob.name)
 
-        bm.from_mesh(me)
+        if key is not None and cached is not None and cached[0] == key:
+            vols_local[i] = cached[1]
+            continue
 
+        # Mesh data access is not thread safe
+        me = ob_eval.to_mesh()
+        queue.append((i, key, *_mesh_arrays(me)))
         ob_eval.to_mesh_clear()
 
-    bmesh.ops.triangulate(bm, faces=bm.faces, quad_method="SHORT_EDGE")
+    if queue:
+        if workers > 1 and len(queue) > 1:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=min(workers, len(queue))) as executor:
+                results = list(executor.map(lambda x: _signed_volume(x[2], x[3]), queue))
+        else:
+            results = [_signed_volume(cos, tris) for _, _, cos, tris in queue]
+
+        for (i, key, _, _), vol in zip(queue, results):
+            vols_local[i] = vol
+            _volume_cache[obs[i].name] = key, vol
+
+    # Volume of an affinely transformed mesh scales by the determinant
+    return [vol * ob.matrix_world.to_3x3().determinant() for ob, vol in zip(obs, vols_local)]
+
+
+def est_volume(obs: Iterable[Object]) -> float:
+    return abs(sum(est_volume_batch(tuple(obs))))
+
+
+def volume_cache_tag(depsgraph) -> None:
+    if not _volume_cache:
+        return
+
+    for upd in depsgraph.updates:
+        if upd.is_updated_geometry and isinstance(upd.id, bpy.types.Object):
+            _volume_cache.pop(upd.id.original.name, None)
 
-    vol = bm.calc_volume()
-    bm.free()
 
-    return vol
+def volume_cache_clear() -> None:
+    _volume_cache.clear()
 
 
 def est_curve_length(ob: Object) -> float:
@@ -0,0 +1,70 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  JewelCraft jewelry design toolkit for Blender.
+#  Copyright (C) 2015-2021  Mikhail Rachinskiy
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+
+import bpy
+from bpy.app.handlers import persistent
+
+from . import gemtable, mesh
+
+
+def handler_add():
+    bpy.app.handlers.depsgraph_update_post.append(_execute)
+    bpy.app.handlers.frame_change_post.append(_frame_change)
+
+    for handlers in _reset_handlers():
+        handlers.append(_reset)
+
+
+def handler_del():
+    bpy.app.handlers.depsgraph_update_post.remove(_execute)
+    bpy.app.handlers.frame_change_post.remove(_frame_change)
+
+    for handlers in _reset_handlers():
+        handlers.remove(_reset)
+
+    _reset(None)
+
+
+def _reset_handlers():
+    return (
+        bpy.app.handlers.load_post,
+        bpy.app.handlers.undo_post,
+        bpy.app.handlers.redo_post,
+    )
+
+
+@persistent
+def _execute(scene, depsgraph):
+    gemtable.tag_update(depsgraph)
+    mesh.volume_cache_tag(depsgraph)
+
+
+@persistent
+def _frame_change(scene, depsgraph=None):
+    # Animated transforms and geometry are not reported by depsgraph_update_post
+    gemtable.clear()
+    mesh.volume_cache_clear()
+
+
+@persistent
+def _reset(dummy):
+    gemtable.clear()
+    mesh.volume_cache_clear()
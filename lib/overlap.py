@@ -0,0 +1,319 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  JewelCraft jewelry design toolkit for Blender.
+#  Copyright (C) 2015-2021  Mikhail Rachinskiy
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+
+from typing import Tuple, Iterator, Optional
+import os
+import itertools
+
+import numpy as np
+
+
+Pairs = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+WORKER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "overlap_worker.py")
+
+
+# Broad phase
+# ------------------------------------
+
+
+_NEIGHBOURS = np.array(tuple(itertools.product((-1, 0, 1), repeat=3)), dtype=np.int64)
+
+# Upper bound of raw cell candidates held in memory at once
+CANDIDATES_CHUNK_MAX = 1 << 20
+
+
+def _expand_ranges(lo: np.ndarray, hi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    counts = hi - lo
+    i = np.repeat(np.arange(len(lo)), counts)
+    ofst = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    j = np.repeat(lo, counts) + ofst
+    return i, j
+
+
+def _chunks(counts: np.ndarray) -> Iterator[slice]:
+    """Split rows into slices holding at most CANDIDATES_CHUNK_MAX candidates,
+    single row can exceed it
+    """
+    bounds = np.cumsum(counts)
+    start = 0
+
+    while start < len(counts):
+        base = bounds[start - 1] if start else 0
+        end = max(start + 1, int(np.searchsorted(bounds, base + CANDIDATES_CHUNK_MAX, side="right")))
+        yield slice(start, end)
+        start = end
+
+
+def find_pairs(locs: np.ndarray, rads: np.ndarray, margin: float) -> Pairs:
+    """Index pairs (both directions) of gems with distance between
+    bounding circles within margin and distances between their centers.
+
+    Each pair is searched from the larger gem, gems are split into levels
+    by query range and every level is queried on a grid sized for it,
+    so a few large stones do not widen the search of melee stones.
+    """
+    empty = np.empty(0, dtype=np.int64)
+
+    if len(locs) < 2:
+        return empty, empty, np.empty(0)
+
+    margin = max(margin, 0.0)
+    ranges = 2.0 * rads + margin
+    range_min = float(ranges[ranges > 0.0].min(initial=np.inf))
+
+    if not np.isfinite(range_min):
+        range_min = 1.0
+
+    levels = np.floor(np.log2(np.maximum(ranges, range_min) / range_min)).astype(np.int64)
+
+    # Unique rank ordered by radius, smaller neighbours are searched by larger gem
+    rank = np.empty(len(rads), dtype=np.int64)
+    rank[np.argsort(rads, kind="stable")] = np.arange(len(rads))
+
+    i1 = []
+    i2 = []
+    dists = []
+
+    for level in np.unique(levels).tolist():
+        is_query = levels == level
+        queries = np.flatnonzero(is_query)
+        targets = np.flatnonzero(levels <= level)
+        cell = float(ranges[is_query].max()) or 1.0
+
+        keys = np.floor(locs[targets] / cell).astype(np.int64)
+        keys_min = keys.min(axis=0) - 1
+        keys -= keys_min
+        dims = keys.max(axis=0) + 2
+
+        def pack(k):
+            return (k[..., 0] * dims[1] + k[..., 1]) * dims[2] + k[..., 2]
+
+        order = np.argsort(pack(keys), kind="stable")
+        keys_sorted = pack(keys)[order]
+        keys_query = np.floor(locs[queries] / cell).astype(np.int64) - keys_min
+
+        for ofst in _NEIGHBOURS:
+            keys_nb = pack(keys_query + ofst)
+            lo = np.searchsorted(keys_sorted, keys_nb, side="left")
+            hi = np.searchsorted(keys_sorted, keys_nb, side="right")
+
+            for chunk in _chunks(hi - lo):
+                i, j = _expand_ranges(lo[chunk], hi[chunk])
+                i = queries[chunk][i]
+                j = targets[order[j]]
+
+                mask = rank[j] < rank[i]
+                i = i[mask]
+                j = j[mask]
+
+                dist = np.linalg.norm(locs[i] - locs[j], axis=1)
+                mask = dist - (rads[i] + rads[j]) <= margin
+
+                i1.append(i[mask])
+                i2.append(j[mask])
+                dists.append(dist[mask])
+
+    i1 = np.concatenate(i1)
+    i2 = np.concatenate(i2)
+    dists = np.concatenate(dists)
+
+    return np.concatenate((i1, i2)), np.concatenate((i2, i1)), np.concatenate((dists, dists))
+
+
+def seek_range_get(rads: np.ndarray, threshold: float) -> float:
+    """Largest possible center distance of two gems closer than threshold"""
+    return 2.0 * float(rads.max(initial=0.0)) + max(threshold, 0.0)
+
+
+# Narrow phase
+# ------------------------------------
+
+
+def _transform(mats: np.ndarray, cos: np.ndarray) -> np.ndarray:
+    return np.einsum("nij,nj->ni", mats[:, :3, :3], cos) + mats[:, :3, 3]
+
+
+def _girdle_point(mats_inv: np.ndarray, rads: np.ndarray, target: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    vec = _transform(mats_inv, target)
+    vec[:, 2] = 0.0
+    length = np.linalg.norm(vec, axis=1)
+    is_zero = length == 0.0
+
+    vec *= (rads / np.where(is_zero, 1.0, length))[:, np.newaxis]
+    vec[is_zero] = 0.0
+    vec[is_zero, 0] = rads[is_zero]
+
+    return vec, is_zero
+
+
+def nearest_coords(locs: np.ndarray, rads: np.ndarray, mats: np.ndarray, mats_inv: np.ndarray, i1: np.ndarray, i2: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Batched counterpart of asset.nearest_coords for index pairs"""
+    vec1, is_coincident = _girdle_point(mats_inv[i1], rads[i1], locs[i2])
+    vec2, _ = _girdle_point(mats_inv[i2], rads[i2], locs[i1])
+
+    vec2[is_coincident] = 0.0
+    vec2[is_coincident, 0] = rads[i2][is_coincident]
+
+    return _transform(mats[i1], vec1), _transform(mats[i2], vec2)
+
+
+def calc_gaps(locs: np.ndarray, rads: np.ndarray, mats: np.ndarray, i1: np.ndarray, i2: np.ndarray, dists: np.ndarray) -> np.ndarray:
+    """Batched counterpart of asset.calc_gap for index pairs"""
+    mats_inv = np.linalg.inv(mats)
+    co1, co2 = nearest_coords(locs, rads, mats, mats_inv, i1, i2)
+    rad1 = rads[i1]
+
+    gaps = np.linalg.norm(co1 - co2, axis=1)
+    is_inside = (np.linalg.norm(locs[i1] - co2, axis=1) < rad1) | (dists < rad1)
+    gaps[is_inside] *= -1.0
+
+    return gaps
+
+
+def unique_pairs(i1: np.ndarray, i2: np.ndarray, gaps: np.ndarray) -> Pairs:
+    """Merge both directions of each pair keeping the smallest gap, sorted by gap"""
+    lo = np.minimum(i1, i2)
+    hi = np.maximum(i1, i2)
+    order = np.lexsort((gaps, hi, lo))
+    lo = lo[order]
+    hi = hi[order]
+    gaps = gaps[order]
+
+    is_first = np.ones(len(lo), dtype=bool)
+    is_first[1:] = (lo[1:] != lo[:-1]) | (hi[1:] != hi[:-1])
+    lo = lo[is_first]
+    hi = hi[is_first]
+    gaps = gaps[is_first]
+
+    order = np.argsort(gaps, kind="stable")
+
+    return lo[order], hi[order], gaps[order]
+
+
+# Overlaps
+# ------------------------------------
+
+
+def find_overlaps(locs: np.ndarray, rads: np.ndarray, mats: np.ndarray, threshold: float, scale: float = 1.0) -> Pairs:
+    """Directed index pairs of gems closer than threshold and their gaps,
+    gaps are multiplied by scale before comparison.
+    """
+    # Threshold is compared with scaled gaps, broad phase works in scene units
+    i1, i2, dists = find_pairs(locs, rads, threshold / scale)
+
+    gaps = calc_gaps(locs, rads, mats, i1, i2, dists)
+
+    if scale != 1.0:
+        gaps *= scale
+
+    mask = gaps < threshold
+
+    return i1[mask], i2[mask], gaps[mask]
+
+
+def _tiles(locs: np.ndarray, seek_range: float, num: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Split locations into slabs along the longest axis, each slab includes
+    neighbours within seek range as a halo and a mask of owned locations.
+    """
+    axis = np.argmax(np.ptp(locs, axis=0))
+    coords = locs[:, axis]
+    bounds = np.quantile(coords, np.linspace(0.0, 1.0, num + 1))
+    bounds[-1] = np.inf
+
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        is_owned = (coords >= lo) & (coords < hi)
+
+        if not is_owned.any():
+            continue
+
+        indices = np.flatnonzero((coords >= lo - seek_range) & (coords < hi + seek_range))
+
+        yield indices, is_owned[indices]
+
+
+def tile_overlaps(locs: np.ndarray, rads: np.ndarray, mats: np.ndarray, is_owned: np.ndarray, threshold: float, scale: float) -> Pairs:
+    i1, i2, gaps = find_overlaps(locs, rads, mats, threshold, scale)
+    mask = is_owned[i1]
+    return i1[mask], i2[mask], gaps[mask]
+
+
+def _tile_run(executable: str, locs: np.ndarray, rads: np.ndarray, mats: np.ndarray, is_owned: np.ndarray, threshold: float, scale: float) -> Pairs:
+    import io
+    import subprocess
+
+    buffer = io.BytesIO()
+    np.savez(buffer, locs=locs, rads=rads, mats=mats, is_owned=is_owned, threshold=threshold, scale=scale)
+
+    proc = subprocess.run(
+        (executable, WORKER_PATH),
+        input=buffer.getvalue(),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        check=True,
+    )
+
+    data = np.load(io.BytesIO(proc.stdout))
+    return data["i1"], data["i2"], data["gaps"]
+
+
+def find_overlaps_parallel(
+    locs: np.ndarray,
+    rads: np.ndarray,
+    mats: np.ndarray,
+    threshold: float,
+    scale: float = 1.0,
+    workers: int = 2,
+    executable: Optional[str] = None,
+) -> Pairs:
+    """Parallel variant of find_overlaps, spatial domain is split into
+    overlapping tiles which are processed by separate Python processes,
+    falls back to find_overlaps if workers fail to run.
+    """
+    import sys
+    from concurrent.futures import ThreadPoolExecutor
+
+    # Workers run a standalone script instead of multiprocessing spawn,
+    # which would re-run the parent __main__ (e.g. a script passed with blender -P)
+    # and needs this module importable without the add-on package.
+
+    if executable is None:
+        executable = sys.executable
+
+    seek_range = seek_range_get(rads, threshold / scale)
+    tiles = list(_tiles(locs, seek_range, workers * 2))
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(
+                executor.map(
+                    lambda x: _tile_run(executable, locs[x[0]], rads[x[0]], mats[x[0]], x[1], threshold, scale),
+                    tiles,
+                )
+            )
+    except Exception:
+        return find_overlaps(locs, rads, mats, threshold, scale)
+
+    i1 = [indices[_i1] for (indices, _), (_i1, _, _) in zip(tiles, results)]
+    i2 = [indices[_i2] for (indices, _), (_, _i2, _) in zip(tiles, results)]
+    gaps = [_gaps for _, _, _gaps in results]
+
+    return np.concatenate(i1), np.concatenate(i2), np.concatenate(gaps)
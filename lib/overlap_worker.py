@@ -0,0 +1,63 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  JewelCraft jewelry design toolkit for Blender.
+#  Copyright (C) 2015-2021  Mikhail Rachinskiy
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+
+"""
+Standalone entry point for overlap tile workers, run with plain Python.
+Reads tile arrays as npz from stdin, writes result arrays as npz to stdout.
+"""
+
+
+import io
+import os
+import sys
+import importlib.util
+
+import numpy as np
+
+
+def _overlap_load():
+    filepath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "overlap.py")
+    spec = importlib.util.spec_from_file_location("_jewelcraft_overlap", filepath)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def main() -> None:
+    overlap = _overlap_load()
+    data = np.load(io.BytesIO(sys.stdin.buffer.read()))
+
+    i1, i2, gaps = overlap.tile_overlaps(
+        data["locs"],
+        data["rads"],
+        data["mats"],
+        data["is_owned"],
+        float(data["threshold"]),
+        float(data["scale"]),
+    )
+
+    buffer = io.BytesIO()
+    np.savez(buffer, i1=i1, i2=i2, gaps=gaps)
+    sys.stdout.buffer.write(buffer.getvalue())
+
+
+if __name__ == "__main__":
+    main()
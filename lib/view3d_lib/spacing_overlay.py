@@ -19,20 +19,21 @@
 # ##### END GPL LICENSE BLOCK #####
 
 
-from typing import Tuple
-from math import tau, sin, cos
-from functools import lru_cache
+from typing import Tuple, List, Dict, Optional
+from math import tau
+import collections
 
 import bpy
-from bpy_extras.view3d_utils import location_3d_to_region_2d
+from bpy.app.handlers import persistent
 import bgl
 import blf
 import gpu
 from gpu_extras.batch import batch_for_shader
 from mathutils import Matrix, Vector
+import numpy as np
 
 from ... import var
-from .. import unit
+from .. import unit, gemtable
 from ..asset import nearest_coords, calc_gap
 from .view3d_overlay import restore_gl
 
@@ -40,6 +41,19 @@ from .view3d_overlay import restore_gl
 _handler = None
 _handler_font = None
 _font_loc = []
+_df_cache = {}
+
+
+Color = Tuple[float, float, float, float]
+BatchData = Tuple[List[int], List[float], List[Color], List[Vector], List[Color]]
+
+_CIRCLE_LODS = (
+    # (max radius in pixels, segments)
+    (6.0, 8),
+    (20.0, 16),
+    (60.0, 32),
+    (None, 64),
+)
 
 
 def handler_add(self, context):
@@ -49,6 +63,10 @@ def handler_add(self, context):
     if _handler is None:
         _handler = bpy.types.SpaceView3D.draw_handler_add(_draw, (self, context), "WINDOW", "POST_VIEW")
         _handler_font = bpy.types.SpaceView3D.draw_handler_add(_draw_font, (self, context), "WINDOW", "POST_PIXEL")
+        bpy.app.handlers.depsgraph_update_post.append(_on_depsgraph_update)
+        bpy.app.handlers.load_post.append(_on_reset)
+        bpy.app.handlers.undo_post.append(_on_reset)
+        bpy.app.handlers.redo_post.append(_on_reset)
 
 
 def handler_del():
@@ -58,9 +76,13 @@ def handler_del():
     if _handler is not None:
         bpy.types.SpaceView3D.draw_handler_remove(_handler, "WINDOW")
         bpy.types.SpaceView3D.draw_handler_remove(_handler_font, "WINDOW")
+        bpy.app.handlers.depsgraph_update_post.remove(_on_depsgraph_update)
+        bpy.app.handlers.load_post.remove(_on_reset)
+        bpy.app.handlers.undo_post.remove(_on_reset)
+        bpy.app.handlers.redo_post.remove(_on_reset)
         _handler = None
         _handler_font = None
-        _circle_cos.cache_clear()
+        _df_cache.clear()
 
 
 def handler_toggle(self, context):
@@ -71,75 +93,206 @@ def handler_toggle(self, context):
             handler_del()
 
 
-# Cache control
+# Instance face cache
 # -------------------------------------
 
 
-class CacheControl:
-    __slots__ = "cache_size"
+@persistent
+def _on_depsgraph_update(scene, depsgraph):
+    if not _df_cache:
+        return
 
-    def __init__(self) -> None:
-        self.cache_size = 64
+    # Edit mesh changes are reported either for the object or for its mesh
+    upd_ids = {upd.id.original.name for upd in depsgraph.updates if isinstance(upd.id, (bpy.types.Object, bpy.types.Mesh))}
 
-    def set(self, show_all: bool, num: int) -> None:
-        if not show_all:
-            if self.cache_size != 64:
-                self.cache_size = 64
-                self.wrap(64)
-            return
+    for name, (me_name, _, _) in tuple(_df_cache.items()):
+        if name in upd_ids or me_name in upd_ids:
+            del _df_cache[name]
 
-        if num > self.cache_size:
-            self.cache_size = num + 50
-            self.wrap(self.cache_size)
 
-    @staticmethod
-    def wrap(size):
-        global _circle_cos
+@persistent
+def _on_reset(dummy):
+    _df_cache.clear()
 
-        _circle_cos.cache_clear()
-        _circle_cos = lru_cache(maxsize=size)(_circle_cos.__wrapped__)
 
+# -------------------------------------
 
-_CC = CacheControl()
 
+def _circle_unit(segments: int) -> Tuple[np.ndarray, np.ndarray]:
+    angles = np.arange(segments) * (tau / segments)
+    cos = np.column_stack((np.sin(angles), np.cos(angles), np.zeros(segments)))
+    edges = np.column_stack((np.arange(segments), np.roll(np.arange(segments), -1))).astype(np.int32)
+    return cos, edges
 
-# -------------------------------------
 
+_CIRCLE_UNITS = {segments: _circle_unit(segments) for _, segments in _CIRCLE_LODS}
 
-@lru_cache(maxsize=64)
-def _circle_cos(radius: float, mat: Matrix) -> Tuple[Vector, ...]:
-    angle = tau / 64
 
-    return tuple(
-        (
-            mat @ Vector(
-                (
-                    sin(i * angle) * radius,
-                    cos(i * angle) * radius,
-                    0.0,
-                )
-            )
-        ).freeze()
-        for i in range(64)
+def _circle_cos(rads: np.ndarray, mats: np.ndarray, segments: int) -> np.ndarray:
+    """Circles transformed by stacked (N, 4, 4) matrices as (N * segments, 3) array"""
+    cos = _CIRCLE_UNITS[segments][0][np.newaxis] * rads[:, np.newaxis, np.newaxis]
+    cos = np.einsum("nij,nkj->nki", mats[:, :3, :3], cos) + mats[:, np.newaxis, :3, 3]
+    return cos.reshape(-1, 3)
+
+
+def _circle_lod(rads: np.ndarray, mats: np.ndarray, region, region_3d) -> np.ndarray:
+    """Segment count from projected on-screen radius, zero for circles outside of view frustum"""
+    persp = np.array(region_3d.perspective_matrix)
+    half_w = region.width / 2
+    half_h = region.height / 2
+
+    rads = rads * np.linalg.norm(mats[:, :3, :3], axis=1).max(axis=1)
+    prj = mats[:, :, 3] @ persp.T
+    w = prj[:, 3]
+
+    if region_3d.is_perspective:
+        is_near = w <= rads
+    else:
+        is_near = np.zeros(len(rads), dtype=bool)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        w_safe = np.where(is_near, 1.0, w)
+        rad_x = rads * np.linalg.norm(persp[0, :3]) / w_safe
+        rad_y = rads * np.linalg.norm(persp[1, :3]) / w_safe
+        ndc_x = prj[:, 0] / w_safe
+        ndc_y = prj[:, 1] / w_safe
+
+    is_visible = is_near | (
+        (np.abs(ndc_x) <= 1.0 + rad_x) &
+        (np.abs(ndc_y) <= 1.0 + rad_y)
     )
+    is_visible &= w >= -rads
+
+    rads_px = np.maximum(rad_x * half_w, rad_y * half_h)
+    rads_px[is_near] = np.inf
+
+    segments = np.zeros(len(rads), dtype=np.int32)
+
+    for rad_max, seg in reversed(_CIRCLE_LODS):
+        if rad_max is None:
+            segments[:] = seg
+        else:
+            segments[rads_px < rad_max] = seg
+
+    segments[~is_visible] = 0
+
+    return segments
 
 
 def get_df_transform(df, context, depsgraph) -> Tuple[Vector, Matrix]:
-    df.update_from_editmode()
+    cache = _df_cache.get(df.name)
+
+    if cache is None:
+        df.update_from_editmode()
+
+        if df.modifiers and df.is_deform_modified(context.scene, "PREVIEW"):
+            df_eval = df.evaluated_get(depsgraph)
+            polys = df_eval.to_mesh().polygons
+        else:
+            df_eval = df
+            polys = df.data.polygons
+
+        poly = polys[df.data.polygons.active]
+        center = poly.center.copy()
+        mat_rot = poly.normal.to_track_quat("Z", "Y").to_matrix().to_4x4()
+        df_eval.to_mesh_clear()
+
+        cache = _df_cache[df.name] = (df.data.name, center, mat_rot)
+
+    _, center, mat_rot = cache
+
+    return df.matrix_world @ center, mat_rot
+
+
+def _batch_add_circle(batches: Dict[float, BatchData], linewidth: float, i: int, radius: float, color: Color) -> None:
+    circle_ids, circle_rads, circle_colors, _, _ = batches[linewidth]
+    circle_ids.append(i)
+    circle_rads.append(radius)
+    circle_colors.append(tuple(color))
+
+
+def _batch_add_line(batches: Dict[float, BatchData], linewidth: float, co1: Vector, co2: Vector, color: Color) -> None:
+    _, _, _, line_cos, line_colors = batches[linewidth]
+    line_cos += (co1, co2)
+    line_colors += [tuple(color)] * 2
+
+
+def _batch_arrays(data: BatchData, mats: np.ndarray, region, region_3d) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    circle_ids, circle_rads, circle_colors, line_cos, line_colors = data
+    cos = []
+    colors = []
+    indices = []
+    ofst = 0
+
+    # Circles
+    # ---------------------------
+
+    if circle_ids:
+        rads = np.array(circle_rads)
+        mats = mats[circle_ids]
+        _colors = np.array(circle_colors, dtype=np.float32)
+        lods = _circle_lod(rads, mats, region, region_3d)
 
-    if df.modifiers and df.is_deform_modified(context.scene, "PREVIEW"):
-        df_eval = df.evaluated_get(depsgraph)
-        polys = df_eval.to_mesh().polygons
+        for _, segments in _CIRCLE_LODS:
+            mask = lods == segments
+            num = np.count_nonzero(mask)
+
+            if not num:
+                continue
+
+            edges = _CIRCLE_UNITS[segments][1]
+            starts = np.arange(ofst, ofst + num * segments, segments, dtype=np.int32)
+
+            cos.append(_circle_cos(rads[mask], mats[mask], segments))
+            colors.append(np.repeat(_colors[mask], segments, axis=0))
+            indices.append((edges[np.newaxis] + starts[:, np.newaxis, np.newaxis]).reshape(-1, 2))
+
+            ofst += num * segments
+
+    # Lines
+    # ---------------------------
+
+    if line_cos:
+        num = len(line_cos)
+        cos.append(np.array(line_cos))
+        colors.append(np.array(line_colors, dtype=np.float32))
+        indices.append(np.arange(ofst, ofst + num, dtype=np.int32).reshape(-1, 2))
+
+    if not cos:
+        return None
+
+    return (
+        np.concatenate(cos).astype(np.float32),
+        np.concatenate(colors),
+        np.concatenate(indices),
+    )
+
+
+def _batch_draw(batches: Dict[float, BatchData], mats: np.ndarray, context) -> None:
+    if var.USE_POLYLINE:
+        shader = gpu.shader.from_builtin("3D_POLYLINE_FLAT_COLOR")
     else:
-        df_eval = df
-        polys = df.data.polygons
+        shader = gpu.shader.from_builtin("3D_FLAT_COLOR")
+
+    shader.bind()
+
+    if var.USE_POLYLINE:
+        shader.uniform_float("viewportSize", (context.area.width, context.area.height))
+
+    for linewidth, data in batches.items():
+        arrays = _batch_arrays(data, mats, context.region, context.region_data)
+
+        if arrays is None:
+            continue
 
-    poly = polys[df.data.polygons.active]
-    loc1 = df.matrix_world @ poly.center
-    mat_rot = poly.normal.to_track_quat("Z", "Y").to_matrix().to_4x4()
-    df_eval.to_mesh_clear()
+        if var.USE_POLYLINE:
+            shader.uniform_float("lineWidth", linewidth)
+        else:
+            bgl.glLineWidth(linewidth)
 
-    return loc1, mat_rot
+        cos, colors, indices = arrays
+        batch = batch_for_shader(shader, "LINES", {"pos": cos, "color": colors}, indices=indices)
+        batch.draw(shader)
 
 
 def _draw(self, context):
@@ -175,7 +328,6 @@ def _draw(self, context):
     default_linewidth = prefs.overlay_linewidth
 
     diplay_thold = default_spacing + 0.5
-    gems_count = 0
     depsgraph = context.evaluated_depsgraph_get()
 
     # Gem 1 transform
@@ -188,7 +340,8 @@ def _draw(self, context):
         else:
             ob1_spacing = default_spacing
 
-        from_scene_scale = unit.Scale(context).from_scene
+        UnitScale = unit.Scale(context)
+        from_scene_scale = UnitScale.from_scene
 
         if is_df:
             df_pass = False
@@ -202,43 +355,23 @@ def _draw(self, context):
         mat1 = mat_loc @ mat_rot
         mat1.freeze()
 
-    # Shader
-    # -----------------------------------
-
-    bgl.glEnable(bgl.GL_BLEND)
-
-    if var.USE_POLYLINE:
-        shader = gpu.shader.from_builtin("3D_POLYLINE_UNIFORM_COLOR")
-    else:
-        shader = gpu.shader.from_builtin("3D_UNIFORM_COLOR")
-        bgl.glEnable(bgl.GL_LINE_SMOOTH)
-        bgl.glDepthMask(bgl.GL_FALSE)
-
-    if not props.overlay_show_in_front:
-        bgl.glEnable(bgl.GL_DEPTH_TEST)
-
-    shader.bind()
-
-    if var.USE_POLYLINE:
-        shader.uniform_float("viewportSize", (context.area.width, context.area.height))
+    batches = collections.defaultdict(lambda: ([], [], [], [], []))
 
     # Main loop
     # -----------------------------------
 
-    for dup in depsgraph.object_instances:
-
-        if dup.is_instance:
-            ob2 = dup.instance_object.original
-        else:
-            ob2 = dup.object.original
+    GemTable = gemtable.get(context)
 
-        if "gem" not in ob2:
-            continue
-
-        gems_count += 1
+    if is_gem and not show_all:
+        seek_range = rad1 + GemTable.max_rad + UnitScale.to_scene(diplay_thold)
+        indices = GemTable.find_range(loc1, seek_range)
+    else:
+        indices = range(len(GemTable))
 
-        rad2 = max(ob2.dimensions.xy) / 2
-        loc2 = dup.matrix_world.translation
+    for i in indices:
+        ob2 = GemTable.obs[i]
+        rad2 = GemTable.rads[i]
+        ovrd = GemTable.overrides[i]
 
         # Filter out by distance
         # -----------------------------------
@@ -246,6 +379,7 @@ def _draw(self, context):
         use_diplay_dis = False
 
         if is_gem:
+            loc2 = Vector(GemTable.locs[i])
             dis_obs = (loc1 - loc2).length
             proximity_dis = from_scene_scale(dis_obs - (rad1 + rad2))
             proximity_thold = proximity_dis < diplay_thold
@@ -257,43 +391,27 @@ def _draw(self, context):
 
             if is_df:
                 if not df_pass:
-                    df_pass = is_act = dup.matrix_world.translation == loc1
+                    df_pass = is_act = loc2 == loc1
             else:
-                if not dup.is_instance:
+                if not GemTable.is_instance[i]:
                     is_act = ob2 is ob1
 
             use_diplay_dis = not is_act and proximity_thold
 
-        # Gem 2 transform
+        # Gem 2 settings
         # -----------------------------------
 
         if show_all or use_diplay_dis:
 
-            if use_ovrd and "gem_overlay" in ob2:
-                _color = ob2["gem_overlay"].get("color", default_color)
-                _linewidth = ob2["gem_overlay"].get("linewidth", default_linewidth)
-                _spacing = ob2["gem_overlay"].get("spacing", default_spacing)
+            if use_ovrd and ovrd is not None:
+                _color = ovrd.get("color", default_color)
+                _linewidth = ovrd.get("linewidth", default_linewidth)
+                _spacing = ovrd.get("spacing", default_spacing)
             else:
                 _color = default_color
                 _linewidth = default_linewidth
                 _spacing = default_spacing
 
-            shader.uniform_float("color", _color)
-
-            if var.USE_POLYLINE:
-                shader.uniform_float("lineWidth", _linewidth)
-            else:
-                bgl.glLineWidth(_linewidth)
-
-            if dup.is_instance:
-                mat2 = dup.matrix_world.copy()
-            else:
-                mat_loc = Matrix.Translation(loc2)
-                mat_rot = dup.matrix_world.to_quaternion().to_matrix().to_4x4()
-                mat2 = mat_loc @ mat_rot
-
-            mat2.freeze()
-
         # Show distance
         # -----------------------------------
 
@@ -302,6 +420,7 @@ def _draw(self, context):
         if use_diplay_dis:
 
             if dis_obs:
+                mat2 = Matrix(GemTable.mats[i])
                 co1, co2 = nearest_coords(rad1, rad2, mat1, mat2)
                 dis_gap = from_scene_scale(calc_gap(co1, co2, loc1, dis_obs, rad1))
                 gap_thold = dis_gap < diplay_thold
@@ -319,26 +438,83 @@ def _draw(self, context):
             if gap_thold:
 
                 if dis_gap < 0.1:
-                    shader.uniform_float("color", (1.0, 0.0, 0.0, 1.0))
+                    _color = (1.0, 0.0, 0.0, 1.0)
                 elif dis_gap < _spacing:
-                    shader.uniform_float("color", (1.0, 0.9, 0.0, 1.0))
+                    _color = (1.0, 0.9, 0.0, 1.0)
 
                 _font_loc.append((dis_gap, mid, from_scene_scale(max(ob1_spacing, _spacing))))
-
-                batch = batch_for_shader(shader, "LINES", {"pos": (co1, co2)})
-                batch.draw(shader)
+                _batch_add_line(batches, _linewidth, co1, co2, _color)
 
         # Show spacing
         # -----------------------------------
 
         if show_all or spacing_thold:
-            batch = batch_for_shader(shader, "LINE_LOOP", {"pos": _circle_cos(rad2 + _spacing, mat2)})
-            batch.draw(shader)
+            _batch_add_circle(batches, _linewidth, i, rad2 + _spacing, _color)
+
+    if not batches:
+        return
+
+    # Draw
+    # -----------------------------------
+
+    bgl.glEnable(bgl.GL_BLEND)
+
+    if not var.USE_POLYLINE:
+        bgl.glEnable(bgl.GL_LINE_SMOOTH)
+        bgl.glDepthMask(bgl.GL_FALSE)
+
+    if not props.overlay_show_in_front:
+        bgl.glEnable(bgl.GL_DEPTH_TEST)
 
-    _CC.set(show_all, gems_count)
+    _batch_draw(batches, GemTable.mats, context)
     restore_gl()
 
 
+def _label_project(locs: np.ndarray, region, region_3d) -> Tuple[np.ndarray, np.ndarray]:
+    persp = np.array(region_3d.perspective_matrix)
+    prj = np.column_stack((locs, np.ones(len(locs)))) @ persp.T
+    w = prj[:, 3]
+    is_visible = w > 0.0
+    w[~is_visible] = 1.0
+
+    half = np.array((region.width / 2, region.height / 2))
+    cos = half * (1.0 + prj[:, :2] / w[:, np.newaxis])
+
+    return cos, is_visible
+
+
+def _label_decimate(rects: np.ndarray, dists: np.ndarray) -> np.ndarray:
+    """Indices of labels left after rejecting labels which overlap
+    a label with smaller distance, rects are (x_min, y_min, x_max, y_max)
+    """
+    if not len(rects):
+        return np.empty(0, dtype=np.int64)
+
+    # Cell as large as the largest label, overlapping labels are in neighbouring cells
+    cell = (rects[:, 2:] - rects[:, :2]).max(axis=0).clip(min=1.0)
+    keys = np.floor(rects[:, :2] / cell).astype(np.int64).tolist()
+    rects_list = rects.tolist()
+    grid = {}
+    kept = []
+
+    for i in np.argsort(dists, kind="stable").tolist():
+        x_min, y_min, x_max, y_max = rect = rects_list[i]
+        kx, ky = keys[i]
+
+        is_overlap = any(
+            x_min < x_max2 and x_min2 < x_max and y_min < y_max2 and y_min2 < y_max
+            for nx in (kx - 1, kx, kx + 1)
+            for ny in (ky - 1, ky, ky + 1)
+            for x_min2, y_min2, x_max2, y_max2 in grid.get((nx, ny), ())
+        )
+
+        if not is_overlap:
+            grid.setdefault((kx, ky), []).append(rect)
+            kept.append(i)
+
+    return np.sort(np.array(kept, dtype=np.int64))
+
+
 def _draw_font(self, context):
     global _font_loc
 
@@ -346,45 +522,87 @@ def _draw_font(self, context):
         return
 
     region = context.region
-    region_3d = context.space_data.region_3d
+    region_3d = context.region_data
     prefs = context.preferences.addons[var.ADDON_ID].preferences
     font_size = prefs.overlay_fontsize_distance
     fontid = 0
     blf.size(fontid, font_size, 72)
     blf.color(fontid, 1.0, 1.0, 1.0, 1.0)
-    shader = gpu.shader.from_builtin("2D_UNIFORM_COLOR")
 
-    for dist, loc, spacing in _font_loc:
-        bgl.glEnable(bgl.GL_BLEND)
+    dists = np.array([x[0] for x in _font_loc])
+    locs = np.array([x[1] for x in _font_loc])
+    spacings = np.array([x[2] for x in _font_loc])
+    _font_loc.clear()
 
-        if dist < 0.1:
-            color = (0.9, 0.0, 0.0, 1.0)
-        elif dist < spacing:
-            color = (0.9, 0.7, 0.0, 1.0)
-        else:
-            color = (0.0, 0.0, 0.0, 0.3)
+    # Labels
+    # ----------------------------
 
-        dis_str = f"{dist:.2f}"
-        dim_x, dim_y = blf.dimensions(fontid, dis_str)
-        loc_x, loc_y = location_3d_to_region_2d(region, region_3d, loc)
+    cos, is_visible = _label_project(locs, region, region_3d)
+    _, dim_y = blf.dimensions(fontid, "0.00")
 
-        verts = (
-            (loc_x - 3,         loc_y - 4),
-            (loc_x + 3 + dim_x, loc_y - 4),
-            (loc_x + 3 + dim_x, loc_y + 4 + dim_y),
-            (loc_x - 3,         loc_y + 4 + dim_y),
-        )
+    indices = np.flatnonzero(is_visible)
+    cos = cos[indices]
+    dists = dists[indices]
+    spacings = spacings[indices]
+
+    dis_strs = [f"{x:.2f}" for x in dists.tolist()]
+    dims = {x: blf.dimensions(fontid, x)[0] for x in set(dis_strs)}
+    dims_x = np.array([dims[x] for x in dis_strs]).reshape(-1)
+
+    x_min = cos[:, 0] - 3
+    x_max = cos[:, 0] + 3 + dims_x
+    y_min = cos[:, 1] - 4
+    y_max = cos[:, 1] + 4 + dim_y
+
+    indices = _label_decimate(np.column_stack((x_min, y_min, x_max, y_max)), dists)
 
-        shader.bind()
-        shader.uniform_float("color", color)
-        batch_font = batch_for_shader(shader, "TRI_FAN", {"pos": verts})
-        batch_font.draw(shader)
+    if not len(indices):
+        return
+
+    cos = cos[indices]
+    dists = dists[indices]
+    spacings = spacings[indices]
+    dis_strs = [dis_strs[i] for i in indices.tolist()]
+    x_min = x_min[indices]
+    x_max = x_max[indices]
+    y_min = y_min[indices]
+    y_max = y_max[indices]
+
+    # Background
+    # ----------------------------
+
+    colors = np.empty((len(dists), 4), dtype=np.float32)
+    colors[:] = (0.0, 0.0, 0.0, 0.3)
+    colors[dists < spacings] = (0.9, 0.7, 0.0, 1.0)
+    colors[dists < 0.1] = (0.9, 0.0, 0.0, 1.0)
+
+    verts = np.stack(
+        (
+            np.column_stack((x_min, y_min)),
+            np.column_stack((x_max, y_min)),
+            np.column_stack((x_max, y_max)),
+            np.column_stack((x_min, y_max)),
+        ),
+        axis=1,
+    ).reshape(-1, 2).astype(np.float32)
+
+    starts = np.arange(0, len(verts), 4, dtype=np.int32)[:, np.newaxis, np.newaxis]
+    tris = (np.array(((0, 1, 2), (0, 2, 3)), dtype=np.int32) + starts).reshape(-1, 3)
 
+    bgl.glEnable(bgl.GL_BLEND)
+
+    shader = gpu.shader.from_builtin("2D_FLAT_COLOR")
+    shader.bind()
+    batch = batch_for_shader(shader, "TRIS", {"pos": verts, "color": np.repeat(colors, 4, axis=0)}, indices=tris)
+    batch.draw(shader)
+
+    # Text
+    # ----------------------------
+
+    for (loc_x, loc_y), dis_str in zip(cos.tolist(), dis_strs):
         blf.position(fontid, loc_x, loc_y, 0.0)
         blf.draw(fontid, dis_str)
 
-    _font_loc.clear()
-
     # Restore OpenGL defaults
     # ----------------------------
 
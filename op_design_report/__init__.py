@@ -26,6 +26,7 @@ from bpy.types import Operator
 from bpy.props import EnumProperty, BoolProperty, StringProperty
 
 from .. import var
+from . import report_live
 
 
 class WM_OT_design_report(Operator):
@@ -50,6 +51,14 @@ class WM_OT_design_report(Operator):
         name="Warnings",
         default=True,
     )
+    use_json: BoolProperty(
+        name="JSON",
+        description="Also save report data as JSON",
+    )
+    use_csv: BoolProperty(
+        name="CSV",
+        description="Also save report data as CSV",
+    )
     filepath: StringProperty(
         subtype="FILE_PATH",
         options={"SKIP_SAVE", "HIDDEN"},
@@ -64,10 +73,14 @@ class WM_OT_design_report(Operator):
         layout.prop(self, "lang")
         layout.prop(self, "show_warnings")
 
+        col = layout.column(heading="Export Data")
+        col.prop(self, "use_json")
+        col.prop(self, "use_csv")
+
     def execute(self, context):
         import webbrowser
         from ..lib import gettext
-        from . import report_get, report_fmt, html_doc
+        from . import report_get, report_fmt, report_export, html_doc
 
         Report = report_get.data_collect(show_warnings=self.show_warnings)
 
@@ -75,6 +88,13 @@ class WM_OT_design_report(Operator):
             self.report({"ERROR"}, "Nothing to report")
             return {"CANCELLED"}
 
+        filepath_noext = os.path.splitext(self.filepath)[0]
+
+        if self.use_json:
+            report_export.write_json(Report, filepath_noext + ".json")
+        if self.use_csv:
+            report_export.write_csv(Report, filepath_noext + ".csv")
+
         _gettext = gettext.GetText(self.lang).gettext
         report_fmt.data_format(Report, _gettext)
         doc = html_doc.make(Report, self.filename, _gettext)
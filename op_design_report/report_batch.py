@@ -0,0 +1,288 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  JewelCraft jewelry design toolkit for Blender.
+#  Copyright (C) 2015-2021  Mikhail Rachinskiy
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+
+"""
+Batch design report for a set of .blend files.
+
+Usage:
+    blender -b -P op_design_report/report_batch.py -- PATH [PATH ...] [options]
+
+PATH is a .blend file or a directory containing .blend files.
+Each file is opened in its own background Blender instance,
+reports are written to the output directory along with index.html.
+"""
+
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from types import ModuleType
+from typing import List, Dict, Any, Optional, Sequence
+
+import bpy
+
+
+ADDON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ADDON_ID = os.path.basename(ADDON_DIR)
+RESULT_PREFIX = "JEWELCRAFT_REPORT:"
+
+
+def _args_parse(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="report_batch", description="Batch design report for .blend files")
+    parser.add_argument("paths", nargs="*", help=".blend files or directories")
+    parser.add_argument("-o", "--output", default="", help="output directory, defaults to the directory of each file")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="number of Blender instances")
+    parser.add_argument("--format", default="html", help="comma separated output formats: html, json, csv")
+    parser.add_argument("--lang", default="AUTO", help="report language")
+    parser.add_argument("--no-warnings", action="store_true", help="exclude warnings from reports")
+    parser.add_argument("--timeout", type=float, default=None, help="time limit per file in seconds")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def _args_get() -> argparse.Namespace:
+    if "--" in sys.argv:
+        argv = sys.argv[sys.argv.index("--") + 1:]
+    else:
+        argv = []
+    return _args_parse(argv)
+
+
+def _blend_files(paths: Sequence[str]) -> List[str]:
+    files = []
+
+    for path in paths:
+        path = os.path.abspath(path)
+
+        if os.path.isdir(path):
+            for entry in sorted(os.scandir(path), key=lambda x: x.name):
+                if entry.is_file() and entry.name.endswith(".blend"):
+                    files.append(entry.path)
+        elif path.endswith(".blend"):
+            files.append(path)
+
+    return files
+
+
+def _report_path(filepath: str, output: str, ext: str = ".html") -> str:
+    filename = os.path.splitext(os.path.basename(filepath))[0] + " Report" + ext
+    return os.path.join(output or os.path.dirname(filepath), filename)
+
+
+def _path_add() -> None:
+    if os.path.dirname(ADDON_DIR) not in sys.path:
+        sys.path.append(os.path.dirname(ADDON_DIR))
+
+
+def _import(name: str) -> ModuleType:
+    import importlib
+
+    _path_add()
+    return importlib.import_module(f"{ADDON_ID}.{name}")
+
+
+# Worker
+# ---------------------------
+
+
+def _worker(args: argparse.Namespace) -> None:
+    import addon_utils
+
+    _path_add()
+    addon_utils.enable(ADDON_ID, default_set=False)
+
+    report_get = _import("op_design_report.report_get")
+    report_fmt = _import("op_design_report.report_fmt")
+    report_export = _import("op_design_report.report_export")
+    html_doc = _import("op_design_report.html_doc")
+    gettext = _import("lib.gettext")
+
+    filepath = bpy.data.filepath
+    result = {
+        "file": filepath,
+        "report": None,
+        "is_empty": True,
+        "gems": 0,
+        "carats": 0.0,
+        "warnings": [],
+    }
+
+    Report = report_get.data_collect(show_warnings=not args.no_warnings)
+
+    if not Report.is_empty():
+        formats = {x.strip().lower() for x in args.format.split(",")}
+
+        if "json" in formats:
+            report_export.write_json(Report, _report_path(filepath, args.output, ".json"))
+        if "csv" in formats:
+            report_export.write_csv(Report, _report_path(filepath, args.output, ".csv"))
+
+        _gettext = gettext.GetText(args.lang).gettext
+        report_fmt.data_format(Report, _gettext)
+
+        report_path = _report_path(filepath, args.output)
+        title = os.path.splitext(os.path.basename(report_path))[0]
+        doc = html_doc.make(Report, title, _gettext)
+
+        if "html" in formats:
+            with open(report_path, "w", encoding="utf-8") as file:
+                file.write(doc)
+
+            result["report"] = report_path
+
+        result["is_empty"] = False
+        result["gems"] = sum(x[4] for x in Report.gems)
+        result["carats"] = round(sum(x[5] for x in Report.gems), 3)
+        result["warnings"] = Report.warnings
+
+    print(RESULT_PREFIX + json.dumps(result), flush=True)
+
+
+# Master
+# ---------------------------
+
+
+def _run_file(filepath: str, args: argparse.Namespace) -> Dict[str, Any]:
+    import subprocess
+
+    cmd = [
+        bpy.app.binary_path,
+        "--background",
+        "--python-exit-code", "1",
+        filepath,
+        "--python", os.path.abspath(__file__),
+        "--",
+        "--worker",
+        "--format", args.format,
+        "--lang", args.lang,
+        "--output", args.output,
+    ]
+    if args.no_warnings:
+        cmd.append("--no-warnings")
+
+    result = {"file": filepath, "error": None}
+
+    try:
+        proc = subprocess.run(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True,
+            encoding="utf-8",
+            errors="replace",
+            timeout=args.timeout,
+        )
+    except subprocess.TimeoutExpired:
+        result["error"] = "Timeout"
+        return result
+
+    for line in proc.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            result.update(json.loads(line[len(RESULT_PREFIX):]))
+            break
+    else:
+        lines = proc.stdout.strip().splitlines()
+        result["error"] = lines[-1] if lines else f"Exit code {proc.returncode}"
+
+    return result
+
+
+def _index_write(results: List[Dict[str, Any]], output: str) -> str:
+    from html import escape
+
+    htmlutils = _import("lib.htmlutils")
+    var = _import("var")
+
+    rows = []
+
+    for res in results:
+        name = escape(os.path.basename(res["file"]))
+
+        if res.get("report"):
+            link = escape(os.path.relpath(res["report"], output).replace(os.sep, "/"))
+            name = f'<a href="{link}">{name}</a>'
+
+        if res.get("error"):
+            status = escape(res["error"])
+        elif res.get("is_empty"):
+            status = "Nothing to report"
+        else:
+            status = "; ".join(escape(x) for x in res["warnings"]) or "OK"
+
+        rows.append((name, res.get("gems", 0), res.get("carats", 0.0), status))
+
+    Doc = htmlutils.Document(var.HTML_DESIGN_REPORT_DIR)
+    Doc.write_list((("Files", len(results)), ("Gems", sum(x[1] for x in rows)), ("Carats", round(sum(x[2] for x in rows), 3))))
+    Doc.write_section("Summary")
+    Doc.write_list(rows)
+    Doc.write_section("Files")
+
+    index_path = os.path.join(output, "index.html")
+
+    with open(index_path, "w", encoding="utf-8") as file:
+        file.write(Doc.make("Design Report Index"))
+
+    return index_path
+
+
+def _master(args: argparse.Namespace) -> Optional[int]:
+    files = _blend_files(args.paths)
+
+    if not files:
+        print("report_batch: no .blend files found")
+        return 1
+
+    if args.output:
+        args.output = os.path.abspath(args.output)
+        os.makedirs(args.output, exist_ok=True)
+
+    results = []
+
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+        for res in executor.map(lambda x: _run_file(x, args), files):
+            status = res["error"] or ("Nothing to report" if res.get("is_empty") else "OK")
+            print(f"report_batch: {res['file']}: {status}", flush=True)
+            results.append(res)
+
+    index_path = _index_write(results, args.output or os.path.commonpath([os.path.dirname(x) for x in files]))
+    print(f"report_batch: {index_path}")
+
+    if any(res["error"] for res in results):
+        return 1
+
+
+def main() -> None:
+    args = _args_get()
+
+    if args.worker:
+        _worker(args)
+        return
+
+    code = _master(args)
+
+    if code:
+        sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  JewelCraft jewelry design toolkit for Blender.
+#  Copyright (C) 2015-2021  Mikhail Rachinskiy
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+
+import csv
+import json
+from typing import Iterator, Dict, Any, TextIO
+
+from ..lib import gemlib
+
+
+CSV_FIELDS = (
+    "section",
+    "type",
+    "id",
+    "cut",
+    "known",
+    "width",
+    "length",
+    "depth",
+    "qty",
+    "carats",
+    "total_carats",
+    "density",
+    "volume",
+    "weight",
+    "value",
+)
+
+
+# Records
+# ---------------------------
+
+
+def _gems(Report) -> Iterator[Dict[str, Any]]:
+    gems = sorted(
+        Report.gems.items(),
+        key=lambda x: (x[0][0], x[0][1], -x[0][2][1], -x[0][2][0]),
+    )
+    cts = gemlib.ct_calc_items([x[0] for x in gems]).tolist()
+
+    for ((stone, cut, size), qty), ct in zip(gems, cts):
+        # Unknown ids carry display prefix
+        is_unknown_stone = stone.startswith("*") and stone[1:] not in gemlib.STONES
+        is_unknown_cut = cut.startswith("*") and cut[1:] not in gemlib.CUTS
+
+        yield {
+            "id": stone[1:] if is_unknown_stone else stone,
+            "cut": cut[1:] if is_unknown_cut else cut,
+            "known": not (is_unknown_stone or is_unknown_cut),
+            "size": list(size),
+            "qty": qty,
+            "carats": ct,
+            "total_carats": round(ct * qty, 3),
+        }
+
+
+def _materials(Report) -> Iterator[Dict[str, Any]]:
+    for (name, density), vol in Report.materials.items():
+        yield {
+            "id": name,
+            "density": density,
+            "volume": round(vol, 4),
+            "weight": round(vol * density, 2),
+        }
+
+
+def _notes(Report) -> Iterator[Dict[str, Any]]:
+    for item_type, name, values in Report.notes:
+        yield {
+            "type": item_type,
+            "id": name,
+            "value": list(values),
+        }
+
+
+# Writers
+# ---------------------------
+
+
+def _json_array(file: TextIO, key: str, records: Iterator[Dict[str, Any]]) -> None:
+    file.write(f'  "{key}": [')
+    sep = "\n"
+
+    for record in records:
+        file.write(sep)
+        file.write("    ")
+        file.write(json.dumps(record, ensure_ascii=False))
+        sep = ",\n"
+
+    file.write("\n  ]" if sep == ",\n" else "]")
+
+
+def write_json(Report, filepath: str) -> None:
+    with open(filepath, "w", encoding="utf-8") as file:
+        file.write("{\n")
+        _json_array(file, "gems", _gems(Report))
+        file.write(",\n")
+        _json_array(file, "materials", _materials(Report))
+        file.write(",\n")
+        _json_array(file, "notes", _notes(Report))
+        file.write(",\n")
+        file.write(f'  "warnings": {json.dumps(Report.warnings, ensure_ascii=False)}\n')
+        file.write("}\n")
+
+
+def write_csv(Report, filepath: str) -> None:
+    with open(filepath, "w", encoding="utf-8", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+
+        for record in _gems(Report):
+            record["width"], record["length"], record["depth"] = record.pop("size")
+            writer.writerow({"section": "gem", **record})
+
+        for record in _materials(Report):
+            writer.writerow({"section": "material", **record})
+
+        for record in _notes(Report):
+            writer.writerow({
+                "section": "note",
+                "type": record["type"],
+                "id": record["id"],
+                "value": " ".join(str(x) for x in record["value"]),
+            })
+
+        for warning in Report.warnings:
+            writer.writerow({"section": "warning", "value": warning})
@@ -32,14 +32,15 @@ def data_format(Report, _: Callable[[str], str]) -> None:
     if Report.gems:
 
         gems_fmt = []
-
-        for (stone, cut, size), qty in sorted(
+        gems = sorted(
             Report.gems.items(),
             key=lambda x: (x[0][0], x[0][1], -x[0][2][1], -x[0][2][0]),
-        ):
+        )
+        cts = gemlib.ct_calc_items([x[0] for x in gems]).tolist()
+
+        for ((stone, cut, size), qty), ct in zip(gems, cts):
 
             w, l, h = size
-            ct = gemlib.ct_calc(stone, cut, size)
             total_ct = round(ct * qty, 3)
 
             try:
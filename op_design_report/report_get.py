@@ -20,11 +20,13 @@
 
 
 import collections
+from typing import Tuple, Dict
 
 import bpy
-from mathutils import Matrix
+import numpy as np
 
-from ..lib import unit, mesh, gemlib
+from ..lib import unit, mesh, gemlib, gemtable
+from ..lib.gemtable import Size
 from . import report_warn
 
 
@@ -44,9 +46,91 @@ class _Data:
         return True
 
 
+GemKey = Tuple[int, int, Size]
+
+
+class _GemsCount:
+    """Gem counts by table codes and per row keys they were counted with"""
+
+    __slots__ = "version_build", "version", "stones", "cuts", "sizes", "counts", "result"
+
+    def __init__(self) -> None:
+        self.version_build = None
+        self.version = None
+        self.counts: Dict[GemKey, int] = {}
+        self.result: Tuple[Dict[Tuple[str, str, Size], int], bool] = ({}, False)
+
+
+_gems_count_state = _GemsCount()
+
+
+def _gems_count(GemTable, mask) -> Tuple[Dict[Tuple[str, str, Size], int], bool]:
+    State = _gems_count_state
+    rows = GemTable.rows_changed(State.version_build, State.version)
+
+    if rows is None:
+        State.counts = {}
+        State.stones = GemTable.stones.copy()
+        State.cuts = GemTable.cuts.copy()
+        State.sizes = GemTable.sizes.copy()
+
+        if mask.any():
+            keys, counts = np.unique(
+                np.column_stack((GemTable.stones[mask], GemTable.cuts[mask], GemTable.sizes[mask])),
+                axis=0,
+                return_counts=True,
+            )
+
+            for (stone, cut, *size), qty in zip(keys.tolist(), counts.tolist()):
+                State.counts[(int(stone), int(cut), tuple(size))] = qty
+
+    elif len(rows):
+        rows = rows[mask[rows]]
+        counts = State.counts
+
+        for i in rows.tolist():
+            key_old = int(State.stones[i]), int(State.cuts[i]), tuple(State.sizes[i].tolist())
+            key_new = int(GemTable.stones[i]), int(GemTable.cuts[i]), tuple(GemTable.sizes[i].tolist())
+
+            counts[key_old] -= 1
+            if not counts[key_old]:
+                del counts[key_old]
+
+            counts[key_new] = counts.get(key_new, 0) + 1
+
+            State.stones[i] = GemTable.stones[i]
+            State.cuts[i] = GemTable.cuts[i]
+            State.sizes[i] = GemTable.sizes[i]
+
+    else:
+        return State.result
+
+    State.version_build = GemTable.version_build
+    State.version = GemTable.version
+
+    gems = {}
+    is_unknown_id = False
+
+    for (stone, cut, size), qty in State.counts.items():
+        stone = GemTable.stone_ids[stone]
+        cut = GemTable.cut_ids[cut]
+
+        if stone not in gemlib.STONES:
+            stone = "*" + stone
+            is_unknown_id = True
+
+        if cut not in gemlib.CUTS:
+            cut = "*" + cut
+            is_unknown_id = True
+
+        gems[(stone, cut, size)] = qty
+
+    State.result = gems, is_unknown_id
+    return State.result
+
+
 def data_collect(gem_map: bool = False, show_warnings: bool = True) -> _Data:
     scene = bpy.context.scene
-    depsgraph = bpy.context.evaluated_depsgraph_get()
     props = scene.jewelcraft
     Scale = unit.Scale(bpy.context)
     Report = _Data()
@@ -87,49 +171,14 @@ def data_collect(gem_map: bool = False, show_warnings: bool = True) -> _Data:
     # Gems
     # ---------------------------
 
-    known_stones = gemlib.STONES.keys()
-    known_cuts = gemlib.CUTS.keys()
-    orig_instance_obs = {dup.instance_object.original for dup in depsgraph.object_instances if dup.is_instance}
-
-    for dup in depsgraph.object_instances:
-
-        if dup.is_instance:
-            ob = dup.instance_object.original
-        else:
-            ob = dup.object.original
-
-        if "gem" not in ob or (not dup.is_instance and ob in orig_instance_obs):
-            continue  # Skip original instance gem objects
-
-        # Gem
-        stone = ob["gem"]["stone"]
-        cut = ob["gem"]["cut"]
-        size = tuple(round(x, 2) for x in Scale.from_scene_batch(ob.dimensions))
-
-        # Warnings
-        loc = dup.matrix_world.to_translation()
-        rad = max(ob.dimensions[:2]) / 2
-        if dup.is_instance:
-            mat = dup.matrix_world.copy()
-        else:
-            mat_loc = Matrix.Translation(loc)
-            mat_rot = dup.matrix_world.to_quaternion().to_matrix().to_4x4()
-            mat = mat_loc @ mat_rot
-        loc.freeze()
-        mat.freeze()
-
-        Warn.overlap_data.append((loc, rad, mat))
-        Warn.df_leftovers(ob)
-
-        if stone not in known_stones:
-            stone = "*" + stone
-            Warn.is_unknown_id = True
+    GemTable = gemtable.get(bpy.context)
+    mask = ~GemTable.is_source  # Skip original instance gem objects
 
-        if cut not in known_cuts:
-            cut = "*" + cut
-            Warn.is_unknown_id = True
+    Warn.gem_table = GemTable
+    Warn.gem_mask = mask
 
-        Report.gems[(stone, cut, size)] += 1
+    gems, Warn.is_unknown_id = _gems_count(GemTable, mask)
+    Report.gems.update(gems)
 
     # Warnings
     # ---------------------------
@@ -0,0 +1,128 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  JewelCraft jewelry design toolkit for Blender.
+#  Copyright (C) 2015-2021  Mikhail Rachinskiy
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+
+from typing import List, Tuple, Optional
+
+import bpy
+from bpy.app.handlers import persistent
+import numpy as np
+
+from ..lib import gemlib
+
+
+UPDATE_INTERVAL = 0.3
+
+
+class Totals:
+    __slots__ = "gems", "carats", "materials"
+
+    def __init__(self) -> None:
+        self.gems = 0
+        self.carats = 0.0
+        self.materials: List[Tuple[str, float]] = []
+
+
+_totals: Optional[Totals] = None
+_is_dirty = True
+_is_used = False
+
+
+def get() -> Optional[Totals]:
+    """Last computed totals, schedule recalculation if outdated"""
+    global _is_used
+    _is_used = True
+
+    if _is_dirty:
+        _tag_update()
+
+    return _totals
+
+
+def _tag_update() -> None:
+    global _is_dirty
+    _is_dirty = True
+
+    if _is_used and not bpy.app.timers.is_registered(_execute):
+        bpy.app.timers.register(_execute, first_interval=UPDATE_INTERVAL)
+
+
+def _calc() -> Totals:
+    from . import report_get
+
+    Report = report_get.data_collect(show_warnings=False)
+    Totals_ = Totals()
+
+    if Report.gems:
+        qtys = np.fromiter(Report.gems.values(), dtype=np.int64, count=len(Report.gems))
+        cts = gemlib.ct_calc_items(list(Report.gems.keys()))
+        Totals_.gems = int(qtys.sum())
+        Totals_.carats = round(float(cts @ qtys), 3)
+
+    for (name, density), vol in Report.materials.items():
+        Totals_.materials.append((name, round(vol * density, 2)))
+
+    return Totals_
+
+
+def _execute() -> None:
+    global _totals, _is_dirty, _is_used
+
+    _is_dirty = False
+    _is_used = False
+    _totals = _calc()
+
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == "VIEW_3D":
+                area.tag_redraw()
+
+
+# Handlers
+# ---------------------------
+
+
+def handler_add():
+    bpy.app.handlers.depsgraph_update_post.append(_on_update)
+    bpy.app.handlers.load_post.append(_on_load)
+
+
+def handler_del():
+    global _totals
+
+    bpy.app.handlers.depsgraph_update_post.remove(_on_update)
+    bpy.app.handlers.load_post.remove(_on_load)
+
+    if bpy.app.timers.is_registered(_execute):
+        bpy.app.timers.unregister(_execute)
+
+    _totals = None
+
+
+@persistent
+def _on_update(scene, depsgraph):
+    _tag_update()
+
+
+@persistent
+def _on_load(dummy):
+    global _totals
+    _totals = None
+    _tag_update()
@@ -19,30 +19,54 @@
 # ##### END GPL LICENSE BLOCK #####
 
 
-from typing import Iterator, Tuple, List
+from typing import Iterator, Tuple, Optional, Dict, Set, Hashable, Callable
+import os
 
 import bpy
 from bpy.types import LayerCollection, Object
-from mathutils import Vector, Matrix
+import numpy as np
 
 from ..lib import unit, asset
 
 
-ObjectData = Tuple[Vector, float, Matrix]
+# Above this many changed gems warnings are recomputed for all gems
+ROWS_UPDATE_MAX = 256
 
+_cache: Dict[str, Tuple[Hashable, bool]] = {}
 
-def _collection_walk(coll: LayerCollection) -> Iterator[LayerCollection]:
+
+class _GemState:
+    """Per gem row warning results kept between report runs"""
+
+    __slots__ = "version_build", "version", "threshold", "is_leftover", "overlaps"
+
+    def __init__(self) -> None:
+        self.version_build = None
+        self.version = None
+        self.threshold = None
+        self.is_leftover = np.empty(0, dtype=bool)
+        self.overlaps: Dict[int, Set[int]] = {}
+
+
+_gem_state = _GemState()
+
+
+def _hidden_collections(coll: LayerCollection, is_hidden: bool = False) -> Iterator[str]:
     for subcoll in coll.children:
-        yield subcoll
+        is_subcoll_hidden = is_hidden or subcoll.hide_viewport
+
+        if is_subcoll_hidden:
+            yield subcoll.collection.name
+
         if subcoll.children:
-            yield from _collection_walk(subcoll)
+            yield from _hidden_collections(subcoll, is_subcoll_hidden)
 
 
 class Warnings:
     __slots__ = (
         "run_checks",
-        "df_leftovers",
-        "overlap_data",
+        "gem_table",
+        "gem_mask",
         "is_unknown_id",
         "is_df_leftovers",
         "is_gem_overlap",
@@ -50,50 +74,144 @@ class Warnings:
     )
 
     def __init__(self, show_warnings: bool) -> None:
-        self.overlap_data: List[ObjectData] = []
+        self.gem_table = None
+        self.gem_mask: Optional[np.ndarray] = None
         self.is_unknown_id = False
         self.is_df_leftovers = False
         self.is_gem_overlap = False
         self.is_collection_visibility = False
 
-        methods = ("run_checks", "df_leftovers")
+        if show_warnings:
+            self.run_checks = self._run_checks
+        else:
+            self.run_checks = self._blank
 
-        for method in methods:
+    def _run_checks(self) -> None:
+        GemTable = self.gem_table
 
-            if show_warnings:
-                func = getattr(self, f"_{method}")
-            else:
-                func = self._blank
+        if GemTable is None:
+            return
 
-            setattr(self, method, func)
+        threshold = unit.Scale(bpy.context).to_scene(0.1)
+        self._gem_state_update(GemTable, self.gem_mask, threshold)
 
-    def _run_checks(self) -> None:
-        self.is_gem_overlap = self._gem_overlap(self.overlap_data)
-        self.is_collection_visibility = self._collection_visibility()
+        self.is_df_leftovers = bool(_gem_state.is_leftover[self.gem_mask].any())
+        self.is_gem_overlap = bool(_gem_state.overlaps)
+
+        # Collection and Scene updates rebuild gem table
+        self.is_collection_visibility = self._cached(
+            "collection_visibility",
+            GemTable.version_build,
+            lambda: self._collection_visibility(GemTable.collections),
+        )
+
+    @staticmethod
+    def _cached(name: str, key: Hashable, func: Callable[[], bool]) -> bool:
+        cached = _cache.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        res = func()
+        _cache[name] = key, res
+        return res
 
     @staticmethod
     def _blank(x=None):
         pass
 
-    def _df_leftovers(self, ob: Object) -> None:
-        if (
-            ob.parent and
-            ob.parent.type == "MESH" and
-            ob.parent.instance_type == "NONE"
-        ):
-            self.is_df_leftovers = True
-            self.df_leftovers = self._blank
-
     @staticmethod
-    def _gem_overlap(ob_data: List[ObjectData]) -> bool:
-        threshold = unit.Scale(bpy.context).to_scene(0.1)
-        return asset.gem_overlap(bpy.context, ob_data, threshold, first_match=True)
+    def _gem_state_update(GemTable, mask: np.ndarray, threshold: float) -> None:
+        State = _gem_state
+        rows = GemTable.rows_changed(State.version_build, State.version)
+
+        if rows is None or State.threshold != threshold or len(rows) > ROWS_UPDATE_MAX:
+            State.is_leftover = _df_leftovers(GemTable, mask)
+            State.overlaps = _gem_overlaps(GemTable, mask, threshold)
+
+        elif len(rows):
+            rows = rows[mask[rows]]
+
+            for i in rows.tolist():
+                State.is_leftover[i] = _is_df_leftover(GemTable.obs[i])
+
+            _gem_overlaps_update(State.overlaps, GemTable, mask, threshold, rows)
+
+        State.version_build = GemTable.version_build
+        State.version = GemTable.version
+        State.threshold = threshold
 
     @staticmethod
-    def _collection_visibility() -> bool:
-        for coll in _collection_walk(bpy.context.view_layer.layer_collection):
-            if coll.hide_viewport:
-                for ob in coll.collection.all_objects:
-                    if "gem" in ob:
-                        return True
-        return False
+    def _collection_visibility(gem_collections: Set[str]) -> bool:
+        if not gem_collections:
+            return False
+        return not gem_collections.isdisjoint(_hidden_collections(bpy.context.view_layer.layer_collection))
+
+
+# Gem checks
+# ---------------------------
+
+
+def _is_df_leftover(ob: Object) -> bool:
+    return bool(
+        ob.parent and
+        ob.parent.type == "MESH" and
+        ob.parent.instance_type == "NONE"
+    )
+
+
+def _df_leftovers(GemTable, mask: np.ndarray) -> np.ndarray:
+    flags = {ob.name: _is_df_leftover(ob) for ob in GemTable.unique_obs(mask)}
+    return np.array([flags.get(ob.name, False) for ob in GemTable.obs], dtype=bool)
+
+
+def _overlap_pairs(rows: np.ndarray, GemTable, threshold: float) -> Iterator[Tuple[int, int]]:
+    pairs = asset.gem_overlap(
+        bpy.context,
+        GemTable.locs[rows],
+        GemTable.rads[rows],
+        GemTable.mats[rows],
+        threshold,
+        pairs=True,
+        workers=os.cpu_count() or 1,
+    )
+
+    for i1, i2, _ in pairs:
+        yield int(rows[i1]), int(rows[i2])
+
+
+def _gem_overlaps(GemTable, mask: np.ndarray, threshold: float) -> Dict[int, Set[int]]:
+    overlaps = {}
+
+    for i1, i2 in _overlap_pairs(np.flatnonzero(mask), GemTable, threshold):
+        overlaps.setdefault(i1, set()).add(i2)
+        overlaps.setdefault(i2, set()).add(i1)
+
+    return overlaps
+
+
+def _gem_overlaps_update(overlaps: Dict[int, Set[int]], GemTable, mask: np.ndarray, threshold: float, rows: np.ndarray) -> None:
+    """Recompute overlaps of changed rows against gems in their reach"""
+    for i in rows.tolist():
+        for j in overlaps.pop(i, ()):
+            overlaps[j].discard(i)
+            if not overlaps[j]:
+                del overlaps[j]
+
+    if not len(rows):
+        return
+
+    rows_all = np.flatnonzero(mask)
+    locs = GemTable.locs[rows_all]
+    reach = GemTable.rads[rows_all].max() + threshold / unit.Scale(bpy.context).from_scene(1.0)
+    is_near = np.zeros(len(rows_all), dtype=bool)
+
+    for i in rows.tolist():
+        diff = locs - GemTable.locs[i]
+        is_near |= np.einsum("ij,ij->i", diff, diff) <= (GemTable.rads[i] + reach) ** 2
+
+    is_changed = set(rows.tolist())
+
+    for i1, i2 in _overlap_pairs(rows_all[is_near], GemTable, threshold):
+        if i1 in is_changed or i2 in is_changed:
+            overlaps.setdefault(i1, set()).add(i2)
+            overlaps.setdefault(i2, set()).add(i1)
@@ -53,6 +53,10 @@ class VIEW3D_OT_gem_map(Operator):
         description="Save to file in project folder",
         default=True,
     )
+    use_open_large: BoolProperty(
+        name="Open Large Images",
+        description="Open images larger than render tile size in Blender, otherwise only save them to file",
+    )
     first_run: BoolProperty(default=True, options={"HIDDEN"})
 
     def draw(self, context):
@@ -62,6 +66,7 @@ class VIEW3D_OT_gem_map(Operator):
 
         layout.prop(self, "lang")
         layout.prop(self, "use_save")
+        layout.prop(self, "use_open_large")
 
     def modal(self, context, event):
         import time
@@ -87,6 +92,7 @@ class VIEW3D_OT_gem_map(Operator):
         elif event.type in {"ESC", "RET", "SPACE", "NUMPAD_ENTER"}:
             bpy.types.SpaceView3D.draw_handler_remove(self.handler, "WINDOW")
             self.offscreen.free()
+            self.mesh_cache.clear()
             context.workspace.status_text_set(None)
             return {"FINISHED"}
 
@@ -135,6 +141,7 @@ class VIEW3D_OT_gem_map(Operator):
         self.view_state = self.region_3d.perspective_matrix.copy()
         self.render = context.scene.render
         self.offscreen = None
+        self.mesh_cache = {}
         self.handler = None
         self.use_navigate = False
         self.is_rendering = False
@@ -19,19 +19,27 @@
 # ##### END GPL LICENSE BLOCK #####
 
 
-from typing import Tuple
+from typing import Tuple, Optional, Dict, List
 
+import collections
 import operator
-from math import pi
+from math import pi, cos
 
+from bpy.types import Object
+from gpu.types import GPUBatch
 from bpy_extras.view3d_utils import location_3d_to_region_2d, region_2d_to_origin_3d
 import bgl
 import blf
 import gpu
 from gpu_extras.batch import batch_for_shader
 from mathutils import Matrix, Vector
+import numpy as np
 
-from ..lib import unit
+from ..lib import gemtable
+
+
+MeshArrays = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+Color = Tuple[float, float, float, float]
 
 
 class _ViewData:
@@ -48,9 +56,17 @@ def _gamma_correction(color):
     return [x ** 2.2 for x in color]  # NOTE T74139
 
 
-def _loc_3d_to_2d(region, region_3d, loc: Vector, view: _ViewData) -> Tuple[float, float]:
-    x, y = location_3d_to_region_2d(region, region_3d, loc)
-    return (x - view.offset_x) * view.scale_x, (y - view.offset_y) * view.scale_y
+def _locs_3d_to_2d(region, region_3d, cos: np.ndarray, view: _ViewData, mat: Optional[Matrix] = None) -> np.ndarray:
+    """Vectorized location_3d_to_region_2d with view data transform applied"""
+    if mat is not None:
+        mat = np.array(region_3d.perspective_matrix @ mat, dtype=np.float64)
+    else:
+        mat = np.array(region_3d.perspective_matrix, dtype=np.float64)
+
+    prj = cos @ mat[:, :3].T + mat[:, 3]
+    half = np.array((region.width / 2, region.height / 2))
+    xy = half + half * (prj[:, :2] / prj[:, 3:4])
+    return (xy - (view.offset_x, view.offset_y)) * (view.scale_x, view.scale_y)
 
 
 def _get_frame(context, region, region_3d) -> Tuple[float, float, Vector]:
@@ -62,6 +78,48 @@ def _get_frame(context, region, region_3d) -> Tuple[float, float, Vector]:
     return frame[1].x - frame[2].x, frame[0].y - frame[1].y, frame[2]
 
 
+def _mesh_key(ob: Object) -> Tuple[str, ...]:
+    # Objects with modifiers are evaluated separately, instances of the same object share the key
+    if any(mod.show_viewport for mod in ob.modifiers):
+        return ob.data.name, ob.name
+    return (ob.data.name,)
+
+
+def _mesh_arrays(cache: Dict[Tuple[str, ...], MeshArrays], ob: Object, depsgraph) -> MeshArrays:
+    key = _mesh_key(ob)
+
+    if key in cache:
+        return cache[key]
+
+    ob_eval = ob.evaluated_get(depsgraph)
+    me = ob_eval.to_mesh()
+    me.calc_loop_triangles()
+
+    vert_count = len(me.vertices)
+    poly_count = len(me.polygons)
+    tri_count = len(me.loop_triangles)
+
+    vert_cos = np.empty(vert_count * 3, dtype=np.float32)
+    me.vertices.foreach_get("co", vert_cos)
+    vert_cos = vert_cos.reshape(vert_count, 3).astype(np.float64)
+
+    normals = np.empty(poly_count * 3, dtype=np.float32)
+    me.polygons.foreach_get("normal", normals)
+    normals = normals.reshape(poly_count, 3).astype(np.float64)
+
+    tris = np.empty(tri_count * 3, dtype=np.int32)
+    me.loop_triangles.foreach_get("vertices", tris)
+    tris.shape = (tri_count, 3)
+
+    tri_polys = np.empty(tri_count, dtype=np.int32)
+    me.loop_triangles.foreach_get("polygon_index", tri_polys)
+
+    ob_eval.to_mesh_clear()
+
+    cache[key] = vert_cos, normals, tris, tri_polys
+    return cache[key]
+
+
 def offscreen_refresh(self, context):
     if self.offscreen is not None:
         self.offscreen.free()
@@ -86,7 +144,53 @@ def offscreen_refresh(self, context):
             draw_gems(self, context, gamma_corr=True)
 
 
-def draw_gems(self, context, gamma_corr=False):
+class GemBatches:
+    __slots__ = "batches", "labels", "fontsize"
+
+    def __init__(self, batches: List[Tuple[Color, GPUBatch]], labels: List[Tuple[float, float, str, float]], fontsize: int) -> None:
+        self.batches = batches
+        self.labels = labels
+        self.fontsize = fontsize
+
+    def draw(self) -> None:
+        bgl.glClear(bgl.GL_DEPTH_BUFFER_BIT)
+        bgl.glEnable(bgl.GL_DEPTH_TEST)
+        bgl.glDepthFunc(bgl.GL_LEQUAL)
+
+        shader = gpu.shader.from_builtin("3D_UNIFORM_COLOR")
+        shader.bind()
+
+        for color, batch in self.batches:
+            shader.uniform_float("color", color)
+            batch.draw(shader)
+
+        # Size
+        # -----------------------------
+
+        fontid = 0
+        blf.size(fontid, self.fontsize, 72)
+        blf.color(fontid, 0.0, 0.0, 0.0, 1.0)
+
+        # Plain blf path batches glyphs in 2D and ignores z,
+        # transformed path translates by full position including depth
+        blf.enable(fontid, blf.ROTATION)
+        blf.rotation(fontid, 0.0)
+
+        for loc_x, loc_y, size_fmt, depth in self.labels:
+            dim_x, dim_y = blf.dimensions(fontid, size_fmt)
+
+            blf.position(fontid, round(loc_x - dim_x / 2), round(loc_y - dim_y / 2), depth)
+            blf.draw(fontid, size_fmt)
+
+        blf.disable(fontid, blf.ROTATION)
+        bgl.glDisable(bgl.GL_DEPTH_TEST)
+
+
+def draw_gems(self, context, gamma_corr=False) -> None:
+    gems_prepare(self, context, gamma_corr=gamma_corr).draw()
+
+
+def gems_prepare(self, context, gamma_corr=False) -> GemBatches:
 
     if gamma_corr:
         _c = _gamma_correction
@@ -103,31 +207,22 @@ def draw_gems(self, context, gamma_corr=False):
         center_xy = (self.region.width / 2, self.region.height / 2)
         view_loc = region_2d_to_origin_3d(self.region, self.region_3d, center_xy)
 
-    from_scene_scale_batch = unit.Scale(context).from_scene_batch
     depsgraph = context.evaluated_depsgraph_get()
+    GemTable = gemtable.get(context)
     gems = []
     app = gems.append
 
-    for dup in depsgraph.object_instances:
+    for i, ob in enumerate(GemTable.obs):
 
-        if dup.is_instance:
-            ob = dup.instance_object.original
-        else:
-            ob = dup.object.original
-
-        if "gem" not in ob or (self.use_select and not ob.select_get()):
+        if self.use_select and not ob.select_get():
             continue
 
-        ob_stone = ob["gem"]["stone"]
-        ob_cut = ob["gem"]["cut"]
-        ob_size = tuple(round(x, 2) for x in from_scene_scale_batch(ob.dimensions))
-
-        size_fmt, color = self.view_data.get((ob_stone, ob_cut, ob_size), (None, None))
+        size_fmt, color = self.view_data.get(GemTable.stone_cut_size(i), (None, None))
 
         if color is None:
             continue
 
-        mat = dup.matrix_world.copy()
+        mat = Matrix(GemTable.mats_world[i])
         dist_from_view = (mat.translation - view_loc).length
         app((dist_from_view, ob, mat, size_fmt, color))
 
@@ -144,42 +239,62 @@ def draw_gems(self, context, gamma_corr=False):
         else:
             ViewData.scale_x = ViewData.scale_y = self.render.resolution_percentage / 100
 
-    fontid = 0
-    blf.size(fontid, self.prefs.gem_map_fontsize_gem_size, 72)
-    blf.color(fontid, 0.0, 0.0, 0.0, 1.0)
-    shader = gpu.shader.from_builtin("2D_UNIFORM_COLOR")
-
     gems.sort(key=operator.itemgetter(0), reverse=True)
 
-    for _, ob, mat, size_fmt, color in gems:
+    # Painter's order is kept with depth test,
+    # farther gems get larger depth, labels sit between own and nearer gem
+    depth_step = 2 / (len(gems) + 1)
+    view_normal = np.array(view_normal)
+    cos_thold = cos(angle_thold)
+
+    batches = collections.defaultdict(lambda: ([], [], [0]))
+    labels = []
+
+    for i, (_, ob, mat, size_fmt, color) in enumerate(gems):
+        depth = 1.0 - depth_step * (i + 1)
 
         # Shape
         # -----------------------------
 
-        ob_eval = ob.evaluated_get(depsgraph)
-        me = ob_eval.to_mesh()
-        me.transform(mat)
-        verts = me.vertices
+        vert_cos, normals, tris, tri_polys = _mesh_arrays(self.mesh_cache, ob, depsgraph)
 
-        shader.bind()
-        shader.uniform_float("color", _c(color))
+        # Local normals to world space with inverse transpose,
+        # negative scale flips winding the same way Mesh.transform does
+        mat3 = mat.to_3x3()
+        normals = normals @ np.array(mat3.inverted_safe(), dtype=np.float64)
+        normals /= np.linalg.norm(normals, axis=1, keepdims=True).clip(min=1e-12)
 
-        for poly in me.polygons:
-            if view_normal.angle(poly.normal) < angle_thold:
-                cos = [
-                    _loc_3d_to_2d(self.region, self.region_3d, verts[v].co, ViewData)
-                    for v in poly.vertices
-                ]
-                batch = batch_for_shader(shader, "TRI_FAN", {"pos": cos})
-                batch.draw(shader)
+        if mat3.determinant() < 0.0:
+            normals *= -1.0
 
-        ob_eval.to_mesh_clear()
+        is_visible = normals @ view_normal > cos_thold
+        tris = tris[is_visible[tri_polys]]
 
-        # Size
-        # -----------------------------
+        if len(tris):
+            cos_3d = np.empty((len(vert_cos), 3), dtype=np.float32)
+            cos_3d[:, :2] = _locs_3d_to_2d(self.region, self.region_3d, vert_cos, ViewData, mat)
+            cos_3d[:, 2] = depth
+
+            batch_cos, batch_tris, offset = batches[color]
+            batch_cos.append(cos_3d)
+            batch_tris.append(tris + offset[0])
+            offset[0] += len(cos_3d)
+
+        labels.append((mat.translation, size_fmt, depth - depth_step / 2))
+
+    label_locs = np.array([x[0] for x in labels], dtype=np.float64).reshape(-1, 3)
+    label_locs = _locs_3d_to_2d(self.region, self.region_3d, label_locs, ViewData).tolist()
 
-        loc_x, loc_y = _loc_3d_to_2d(self.region, self.region_3d, mat.translation, ViewData)
-        dim_x, dim_y = blf.dimensions(fontid, size_fmt)
+    shader = gpu.shader.from_builtin("3D_UNIFORM_COLOR")
 
-        blf.position(fontid, round(loc_x - dim_x / 2), round(loc_y - dim_y / 2), 0.0)
-        blf.draw(fontid, size_fmt)
+    return GemBatches(
+        [
+            (
+                _c(color),
+                batch_for_shader(shader, "TRIS", {"pos": np.concatenate(batch_cos)}, indices=np.concatenate(batch_tris)),
+            )
+            for color, (batch_cos, batch_tris, _) in batches.items()
+        ],
+        [(x, y, size_fmt, depth) for (x, y), (_, size_fmt, depth) in zip(label_locs, labels)],
+        self.prefs.gem_map_fontsize_gem_size,
+    )
@@ -28,95 +28,170 @@ import bgl
 import gpu
 from gpu_extras.batch import batch_for_shader
 from mathutils import Matrix
+import numpy as np
 
-from ..lib import asset
+from ..lib import asset, pngutils
 from . import onscreen_text
-from .offscreen import draw_gems
+from .offscreen import gems_prepare
 
 
-def render_map(self, context):
-    image_name = "Gem Map"
-    width, height = self.get_resolution()
-    padding = 30
-    x = padding
-    y = height - padding
-    temp_filepath = os.path.join(tempfile.gettempdir(), "gem_map_temp.png")
+TILE_SIZE = 2048
+# Scene render under the gem map is capped to this size on the long side
+# and upscaled on larger outputs, gems and text are always drawn at full size
+BACKGROUND_SIZE_MAX = 4096
 
-    asset.render_preview(width, height, temp_filepath, compression=15, gamma=2.2)
-    render_image = load_image(temp_filepath)
-    render_image.gl_load()
 
-    mat_offscreen = Matrix()
-    mat_offscreen[0][0] = 2 / width
-    mat_offscreen[0][3] = -1
-    mat_offscreen[1][1] = 2 / height
-    mat_offscreen[1][3] = -1
+def _buffer_to_array(buffer: bgl.Buffer) -> np.ndarray:
+    try:
+        return np.frombuffer(buffer, dtype=np.float32)
+    except TypeError:
+        # NOTE bgl.Buffer has no buffer protocol before Blender 2.91
+        return np.array(buffer.to_list(), dtype=np.float32)
+
+
+def _mat_offscreen(x: int, y: int, width: int, height: int) -> Matrix:
+    mat = Matrix()
+    mat[0][0] = 2 / width
+    mat[0][3] = -1 - 2 * x / width
+    mat[1][1] = 2 / height
+    mat[1][3] = -1 - 2 * y / height
+    return mat
+
 
+def _read_pixels(width: int, height: int) -> np.ndarray:
+    buffer = bgl.Buffer(bgl.GL_FLOAT, width * height * 4)
+    bgl.glReadBuffer(bgl.GL_BACK)
+    bgl.glReadPixels(0, 0, width, height, bgl.GL_RGBA, bgl.GL_FLOAT, buffer)
+    return _buffer_to_array(buffer)
+
+
+def _draw_map(self, render_image, Gems, mat_offscreen: Matrix, width: int, height: int) -> None:
     shader = gpu.shader.from_builtin("2D_UNIFORM_COLOR")
     shader_img = gpu.shader.from_builtin("2D_IMAGE")
-    offscreen = gpu.types.GPUOffScreen(width, height)
+    padding = 30
+
+    bgl.glClear(bgl.GL_COLOR_BUFFER_BIT)
+
+    with gpu.matrix.push_pop():
+        gpu.matrix.load_matrix(mat_offscreen)
+        gpu.matrix.load_projection_matrix(Matrix())
+
+        # Background
+        # --------------------------------
+
+        shader.bind()
+        shader.uniform_float("color", (1.0, 1.0, 1.0, 1.0))
+        batch = batch_for_shader(shader, "TRI_FAN", {"pos": self.rect_coords(0, 0, width, height)})
+        batch.draw(shader)
+
+        # Render result
+        # --------------------------------
+
+        bgl.glEnable(bgl.GL_BLEND)
+
+        bgl.glActiveTexture(bgl.GL_TEXTURE0)
+        bgl.glBindTexture(bgl.GL_TEXTURE_2D, render_image.bindcode)
 
-    with offscreen.bind():
-        bgl.glClear(bgl.GL_COLOR_BUFFER_BIT)
+        shader_img.bind()
+        shader_img.uniform_int("image", 0)
 
-        with gpu.matrix.push_pop():
-            gpu.matrix.load_matrix(mat_offscreen)
-            gpu.matrix.load_projection_matrix(Matrix())
+        args = {
+            "pos": self.rect_coords(0, 0, width, height),
+            "texCoord": self.rect_coords(0, 0, 1, 1),
+        }
 
-            # Background
-            # --------------------------------
+        batch = batch_for_shader(shader_img, "TRI_FAN", args)
+        batch.draw(shader_img)
 
-            shader.bind()
-            shader.uniform_float("color", (1.0, 1.0, 1.0, 1.0))
-            batch = batch_for_shader(shader, "TRI_FAN", {"pos": self.rect_coords(0, 0, width, height)})
-            batch.draw(shader)
+        # Gem map
+        # --------------------------------
 
-            # Render result
-            # --------------------------------
+        Gems.draw()
+        onscreen_text.onscreen_gem_table(self, padding, height - padding, color=(0.0, 0.0, 0.0))
 
-            bgl.glEnable(bgl.GL_BLEND)
 
-            bgl.glActiveTexture(bgl.GL_TEXTURE0)
-            bgl.glBindTexture(bgl.GL_TEXTURE_2D, render_image.bindcode)
+def _render_tiled(self, render_image, Gems, width: int, height: int, filepath: str) -> None:
+    offscreen = gpu.types.GPUOffScreen(TILE_SIZE, TILE_SIZE)
 
-            shader_img.bind()
-            shader_img.uniform_int("image", 0)
+    with pngutils.PNGWriter(filepath, width, height) as png:
 
-            args = {
-                "pos": self.rect_coords(0, 0, width, height),
-                "texCoord": self.rect_coords(0, 0, 1, 1),
-            }
+        # PNG rows go top to bottom, OpenGL rows bottom to top
+        for y in reversed(range(0, height, TILE_SIZE)):
+            tile_h = min(TILE_SIZE, height - y)
+            band = np.empty((tile_h, width, 4), dtype=np.uint8)
 
-            batch = batch_for_shader(shader_img, "TRI_FAN", args)
-            batch.draw(shader_img)
+            for x in range(0, width, TILE_SIZE):
+                tile_w = min(TILE_SIZE, width - x)
 
-            # Gem map
-            # --------------------------------
+                with offscreen.bind():
+                    _draw_map(self, render_image, Gems, _mat_offscreen(x, y, TILE_SIZE, TILE_SIZE), width, height)
+                    pixels = _read_pixels(tile_w, tile_h)
 
-            draw_gems(self, context)
-            onscreen_text.onscreen_gem_table(self, x, y, color=(0.0, 0.0, 0.0))
+                band[:, x:x + tile_w] = (pixels.reshape(tile_h, tile_w, 4) * 255.0 + 0.5).astype(np.uint8)
 
-        buffer = bgl.Buffer(bgl.GL_BYTE, width * height * 4)
-        bgl.glReadBuffer(bgl.GL_BACK)
-        bgl.glReadPixels(0, 0, width, height, bgl.GL_RGBA, bgl.GL_UNSIGNED_BYTE, buffer)
+            png.write_rows(band[::-1])
 
     offscreen.free()
 
-    if image_name not in bpy.data.images:
-        bpy.data.images.new(image_name, width, height)
 
-    image = bpy.data.images[image_name]
-    image.scale(width, height)
-    image.pixels = [v / 255 for v in buffer]
+def render_map(self, context):
+    image_name = "Gem Map"
+    width, height = self.get_resolution()
+    temp_filepath = os.path.join(tempfile.gettempdir(), "gem_map_temp.png")
 
     if self.use_save and bpy.data.is_saved:
         filepath = bpy.data.filepath
         filename = os.path.splitext(os.path.basename(filepath))[0]
         save_path = os.path.join(os.path.dirname(filepath), filename + " Gem Map.png")
+    else:
+        save_path = None
+
+    bg_scale = min(1.0, BACKGROUND_SIZE_MAX / max(width, height))
+    bg_width = max(1, round(width * bg_scale))
+    bg_height = max(1, round(height * bg_scale))
+
+    asset.render_preview(bg_width, bg_height, temp_filepath, compression=15, gamma=2.2)
+    render_image = load_image(temp_filepath)
+    render_image.gl_load()
+
+    Gems = gems_prepare(self, context)
+
+    if width <= TILE_SIZE and height <= TILE_SIZE:
+        offscreen = gpu.types.GPUOffScreen(width, height)
 
-        image.filepath_raw = save_path
-        image.file_format = "PNG"
-        image.save()
+        with offscreen.bind():
+            _draw_map(self, render_image, Gems, _mat_offscreen(0, 0, width, height), width, height)
+            pixels = _read_pixels(width, height)
+
+        offscreen.free()
+
+        if image_name not in bpy.data.images:
+            bpy.data.images.new(image_name, width, height)
+
+        image = bpy.data.images[image_name]
+        image.scale(width, height)
+        image.pixels.foreach_set(pixels)
+
+        if save_path is not None:
+            image.filepath_raw = save_path
+            image.file_format = "PNG"
+            image.save()
+
+    else:
+        # Output is streamed to file, image is then optionally loaded from it
+        if save_path is None:
+            save_path = os.path.join(tempfile.gettempdir(), "Gem Map.png")
+
+        _render_tiled(self, render_image, Gems, width, height, save_path)
+
+        if self.use_open_large:
+            if image_name in bpy.data.images:
+                bpy.data.images.remove(bpy.data.images[image_name])
+
+            image = bpy.data.images.load(save_path)
+            image.name = image_name
+        else:
+            image = None
 
     render_image.gl_free()
     bpy.data.images.remove(render_image)
@@ -132,4 +207,8 @@ def render_map(self, context):
     # Show in a new window
     # ----------------------------
 
+    if image is None:
+        self.report({"INFO"}, f"Gem Map saved to {save_path}")
+        return
+
     asset.show_window(width, height, space_data={"image": image})
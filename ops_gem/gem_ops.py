@@ -210,6 +210,9 @@ class OBJECT_OT_gem_edit(Operator):
 
                         asset.add_material(ob, name=stone_name, color=color, is_gem=True)
 
+                # ID properties edits are not tracked by depsgraph
+                ob.update_tag()
+
         bpy.data.meshes.remove(me)
 
         return {"FINISHED"}
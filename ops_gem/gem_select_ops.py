@@ -22,7 +22,6 @@
 from bpy.props import EnumProperty, FloatProperty, BoolProperty
 from bpy.types import Operator
 from bpy.app.translations import pgettext_tip as _
-from mathutils import Matrix
 
 from ..lib import dynamic_list
 
@@ -134,50 +133,26 @@ class OBJECT_OT_gem_select_overlapping(Operator):
     )
 
     def execute(self, context):
-        from ..lib import asset
+        import os
+        from ..lib import asset, gemtable
 
-        obs = []
-        ob_data = []
-        depsgraph = context.evaluated_depsgraph_get()
-
-        for dup in depsgraph.object_instances:
-
-            if dup.is_instance:
-                ob = dup.instance_object.original
-            else:
-                ob = dup.object.original
+        GemTable = gemtable.get(context)
 
+        for ob in context.visible_objects:
             ob.select_set(False)
 
-            if "gem" in ob:
-                loc = dup.matrix_world.to_translation()
-                rad = max(ob.dimensions[:2]) / 2
-
-                if dup.is_instance:
-                    mat = dup.matrix_world.copy()
-
-                    if ob.parent and ob.parent.is_instancer:
-                        sel = ob.parent
-                    else:
-                        sel = None
-                else:
-                    mat_loc = Matrix.Translation(loc)
-                    mat_rot = dup.matrix_world.to_quaternion().to_matrix().to_4x4()
-                    mat = mat_loc @ mat_rot
-
-                    sel = ob
-
-                loc.freeze()
-                mat.freeze()
-
-                obs.append(sel)
-                ob_data.append((loc, rad, mat))
-
-        overlaps = asset.gem_overlap(context, ob_data, self.threshold)
+        overlaps = asset.gem_overlap(
+            context,
+            GemTable.locs,
+            GemTable.rads,
+            GemTable.mats,
+            self.threshold,
+            workers=os.cpu_count() or 1,
+        )
 
         if overlaps:
             for i in overlaps:
-                ob = obs[i]
+                ob = GemTable.owners[i]
                 if ob:
                     ob.select_set(True)
 
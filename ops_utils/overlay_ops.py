@@ -73,6 +73,7 @@ class OBJECT_OT_overlay_override_add(Operator):
                     "linewidth": self.linewidth,
                     "spacing": self.spacing,
                 }
+                ob.update_tag()
 
         context.area.tag_redraw()
 
@@ -110,6 +111,7 @@ class OBJECT_OT_overlay_override_del(Operator):
         for ob in context.selected_objects:
             if "gem_overlay" in ob:
                 del ob["gem_overlay"]
+                ob.update_tag()
 
         context.area.tag_redraw()
 
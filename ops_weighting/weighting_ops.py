@@ -85,6 +85,7 @@ class OBJECT_OT_weight_display(Operator):
     bl_idname = "object.jewelcraft_weight_display"
 
     def execute(self, context):
+        import os
         from ..lib import unit, mesh, ui_lib
 
         obs = [ob for ob in context.selected_objects if ob.type == "MESH"]
@@ -94,7 +95,9 @@ class OBJECT_OT_weight_display(Operator):
             return {"CANCELLED"}
 
         materials = context.scene.jewelcraft.weighting_materials
-        vol = unit.Scale(context).from_scene_vol(mesh.est_volume(obs))
+        Scale = unit.Scale(context)
+        vols = mesh.est_volume_batch(obs, workers=os.cpu_count() or 1)
+        vol = Scale.from_scene_vol(abs(sum(vols)))
 
         weight_report = []
 
@@ -108,6 +111,13 @@ class OBJECT_OT_weight_display(Operator):
                 weight_fmt = "{} {}  {}".format(weight, _("g"), mat.name)
                 weight_report.append(weight_fmt)
 
+        if len(obs) > 1:
+            weight_report.append("")
+
+            for ob, ob_vol in sorted(zip(obs, vols), key=lambda x: x[0].name):
+                ob_vol = round(Scale.from_scene_vol(abs(ob_vol)), 4)
+                weight_report.append("{} {}  {}".format(ob_vol, _("mm³"), ob.name))
+
         ui_lib.popup_report_batch(self, context, msgs=weight_report, title=_("Weighting"))
 
         return {"FINISHED"}
@@ -622,6 +622,34 @@ class VIEW3D_PT_jewelcraft_design_report(SidebarSetup, Panel):
         layout.operator("view3d.jewelcraft_gem_map")
 
 
+class VIEW3D_PT_jewelcraft_design_report_totals(SidebarSetup, Panel):
+    bl_label = "Totals"
+    bl_options = {"DEFAULT_CLOSED"}
+    bl_parent_id = "VIEW3D_PT_jewelcraft_design_report"
+
+    def draw(self, context):
+        from .op_design_report import report_live
+
+        layout = self.layout
+        Totals = report_live.get()
+
+        if Totals is None:
+            layout.label(text="Calculating...")
+            return
+
+        _ = bpy.app.translations.pgettext_iface
+
+        flow = layout.grid_flow(row_major=True, columns=2, even_columns=True)
+        flow.label(text="Gems")
+        flow.label(text=str(Totals.gems), translate=False)
+        flow.label(text="Carats")
+        flow.label(text=f"{Totals.carats} {_('ct')}", translate=False)
+
+        for name, weight in Totals.materials:
+            flow.label(text=name, translate=False)
+            flow.label(text=f"{weight} {_('g')}", translate=False)
+
+
 class VIEW3D_PT_jewelcraft_measurement(SidebarSetup, Panel):
     bl_label = "Measurement"
     bl_options = {"DEFAULT_CLOSED"}